@@ -1,10 +1,22 @@
 import os
 import pygame
+from pygame.mask import from_surface
+from pygame.transform import rotate
 import random
 import re
 import math
 import utility
 import enum
+import collections
+import dataclasses
+
+# signs to pick from when skewing an enemy's aim; built once rather than
+# as a fresh list every frame
+_AIM_SIGNS = (-1, 1)
+# bound once for the enemies' per-frame aim; still the shared random
+# instance, so random.seed() affects them as before
+_getrandbits = random.getrandbits
+_randrange = random.randrange
 
 class EnemyStates(enum.Enum):
     SMALL = 1
@@ -56,7 +68,10 @@ class Player(pygame.sprite.Sprite):
         self._thrust_animation_speed = thrust_animation_speed
         self._original = self.image  # for applying rotation
         self._area = pygame.display.get_surface().get_rect()
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = from_surface(self.image)
+        # bounding circle for collisions; it encloses the whole image
+        # at any rotation
+        self.radius = math.hypot(*self.image.get_size()) / 2
 
         self.rect = self.image.get_rect(
             center=pygame.math.Vector2(player_pos)
@@ -65,7 +80,7 @@ class Player(pygame.sprite.Sprite):
         self.lives = lives
         self._flash_speed = flash_speed
         self._thrust_power = thrust_power
-        self._thrusting = False
+        self.thrusting = False
         self.alive = True
         self.respawning = False
         self._respawn_length = respawn_length
@@ -97,14 +112,15 @@ class Player(pygame.sprite.Sprite):
         self.velocity = pygame.math.Vector2(0, 0)
         self.velocity_direction = pygame.math.Vector2(0, 0)
 
-    def update(self, delta_time, *args, **kwargs):
+    def update(self, frame, *args, **kwargs):
         """Called every frame to move the player.
 
         Args:
-            delta_time (float): the time since the last update
+            frame (utility.FrameContext): this frame's values
         """
+        delta_time = frame.delta_time
         # animate thrust
-        if not self._thrusting:
+        if not self.thrusting:
             self._image_counter = 0
         else:
             self._image_counter += self._thrust_animation_speed * delta_time
@@ -145,8 +161,7 @@ class Player(pygame.sprite.Sprite):
             self.rect.move(change_position.x, change_position.y), self._area
         )
 
-        # reset
-        self._acceleration_magnitude = 0
+        # reset; thrust stays on until engine_off()
         self._turn_amount = 0
 
     def respawn(self, respawn_length, speed,
@@ -161,17 +176,17 @@ class Player(pygame.sprite.Sprite):
             self.remains_alive = True
 
     def engine_on(self):
-        """Causes thrust to be applied on this frame
+        """Starts applying thrust every frame until engine_off is called
         """
         self._acceleration_magnitude = self._thrust_power
-        self._thrusting = True
-        if not self.thrust_channel.get_busy():
-            self.thrust_channel.play(self.thrust_sound)
+        self.thrusting = True
+        self.thrust_channel.play(self.thrust_sound, loops=-1)
 
     def engine_off(self):
-        """Cancels thrusting animation
+        """Stops applying thrust and cancels the thrusting animation
         """
-        self._thrusting = False
+        self._acceleration_magnitude = 0
+        self.thrusting = False
         self.thrust_channel.stop()
 
     def turn(self, turn_dir):
@@ -197,7 +212,7 @@ class Player(pygame.sprite.Sprite):
         self.in_hyperspace = True
         self.velocity.update(0, 0)
         self._hyperspace_duration = 0
-        self._thrusting = 0
+        self.engine_off()
         self.hyperspace_channel.play(self.hyperspace_sound)
 
         # move player
@@ -224,7 +239,7 @@ class Player(pygame.sprite.Sprite):
         self.velocity.update(0, 0)
         self.rect.center = pos
         self.facing_direction = pygame.math.Vector2(self._initial_dir)
-        self._thrusting = False
+        self.engine_off()
 
     def _calc_velocity(self, delta_time):
         # calculate drag
@@ -255,8 +270,8 @@ class Player(pygame.sprite.Sprite):
         # rotate image
         direction_angle = -math.degrees(math.atan2(self.facing_direction.y,
                                                    self.facing_direction.x))
-        self.image = pygame.transform.rotate(self._original, direction_angle)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.image = rotate(self._original, direction_angle)
+        self.mask = from_surface(self.image)
         self.rect = self.image.get_rect(center=self.rect.center)
 
         if self._invisible:
@@ -266,34 +281,57 @@ class Player(pygame.sprite.Sprite):
 class DeadPlayer(pygame.sprite.Sprite):
     """Class to represent the Player after they have been killed."""
 
-    def __init__(self, folder_name, animation_speed, pos, direction,
-                 velocity, velocity_direction, fluid_density, mass,
+    # animation frames by folder name, loaded on the first death and
+    # shared by every DeadPlayer after that
+    _image_cache = {}
+
+    def __init__(self, folder_name, animation_speed, fluid_density, mass,
                  explosion_channel):
         super().__init__()
-        self._images = []
-        folder = os.path.join('data', 'sprites', folder_name)
-        self._number_of_images = len(os.listdir(folder))
-        for i in range(self._number_of_images):
-            image_name = folder_name + '-' + str(i) + '.png'
-            self._images.append(utility.load_image(image_name, folder,
-                                                   colorkey=(255, 255, 255)))
+        self._images = self._load_images(folder_name)
+        self._number_of_images = len(self._images)
+        self._animation_speed = animation_speed
+        self._fluid_density = fluid_density
+        self.mass = mass
+        self._area = pygame.display.get_surface().get_rect()
+        self.explosion_sound = utility.load_sound('explosion_player.wav')
+        self.explosion_channel = explosion_channel
+
+    def reset(self, pos, direction, velocity, velocity_direction):
+        """Starts the explosion over where the player died. One
+        DeadPlayer is kept per game and reset on each death, rather
+        than built again.
+
+        Args:
+            pos (tuple): the centre of the player when they died
+            direction (pygame.math.Vector2): the way the player faced
+            velocity (pygame.math.Vector2): the player's velocity
+            velocity_direction (pygame.math.Vector2): the direction of
+            the player's velocity
+        """
+        self._image_counter = 0
         self.image = self._images[0]
         self._original = self.image
         self._direction = direction
         self.rect = self.image.get_rect(center=pos)
         self._rotate_image()
-        self._animation_speed = animation_speed
-        self._image_counter = 0
         self.velocity = velocity
         self.velocity_direction = velocity_direction
-        self._fluid_density = fluid_density
-        self.mass = mass
-        self._area = pygame.display.get_surface().get_rect()
-        self.explosion_sound = utility.load_sound('explosion_player.wav')
-        self.explosion_channel = explosion_channel
         self.explosion_channel.play(self.explosion_sound)
 
-    def update(self, delta_time, *args, **kwargs):
+    @classmethod
+    def _load_images(cls, folder_name):
+        images = cls._image_cache.get(folder_name)
+        if images is None:
+            folder = os.path.join('data', 'sprites', folder_name)
+            images = [utility.load_image(folder_name + '-' + str(i) + '.png',
+                                         folder, colorkey=(255, 255, 255))
+                      for i in range(len(os.listdir(folder)))]
+            cls._image_cache[folder_name] = images
+        return images
+
+    def update(self, frame, *args, **kwargs):
+        delta_time = frame.delta_time
         self._image_counter += self._animation_speed * delta_time
         if self._image_counter >= self._number_of_images:
             self.kill()
@@ -309,7 +347,7 @@ class DeadPlayer(pygame.sprite.Sprite):
     def _rotate_image(self):
         direction_angle = -math.degrees(math.atan2(self._direction.y,
                                                    self._direction.x))
-        self.image = pygame.transform.rotate(self._original, direction_angle)
+        self.image = rotate(self._original, direction_angle)
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def _calc_velocity(self, delta_time):
@@ -328,6 +366,25 @@ class DeadPlayer(pygame.sprite.Sprite):
         self.velocity += acceleration * delta_time
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class EnemyConfig:
+    """Fixed settings for spawning enemies, built once per game."""
+    min_speed: int
+    max_speed: int
+    min_angle: float
+    min_player_distance: int
+    width: int
+    height: int
+    fire_rate: float
+    shot_power: int
+    bullet_lifespan: float
+    max_innacuracy_angle: int
+    min_innacuracy_angle: int
+    max_difficulty_at_score: int
+    shot_channel: pygame.mixer.Channel
+    explosion_channel: pygame.mixer.Channel
+
+
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, spawn_position, initial_dir, speed,
                  fire_rate, shot_power, bullet_lifespan, state,
@@ -338,7 +395,10 @@ class Enemy(pygame.sprite.Sprite):
         self.image = utility.load_image(f'enemy-{state.value}.png', folder_name, -1)
         self.state = state
         self.rect = self.image.get_rect(center=spawn_position)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = from_surface(self.image)
+        # bounding circle for collisions; it encloses everything drawn
+        # at any rotation
+        self.radius = utility.mask_radius(self.mask)
         self.facing_direction = pygame.math.Vector2(initial_dir).normalize()
         self.speed = speed / state.value
         self.movement_direction = self.facing_direction.normalize()
@@ -355,9 +415,15 @@ class Enemy(pygame.sprite.Sprite):
             self.max_inaccuracy_angle = max_inaccuracy_angle
             self.min_innacuracy_angle = min_innacuracy_angle
             self.max_score = max_score
-
-    def update(self, delta_time, score, *args, **kwargs):
-        player_rect = kwargs.get('player_rect')
+            # how far off aim is only depends on the score, so it's
+            # worked out again when that changes rather than every frame
+            self._aim_score = None
+            self._inaccuracy_angle = 0
+
+    def update(self, frame, *args, **kwargs):
+        delta_time = frame.delta_time
+        score = frame.score
+        player_rect = frame.player_rect
         if self.state == EnemyStates.SMALL:
             if player_rect is not None:
                 self.facing_direction.update(
@@ -366,15 +432,21 @@ class Enemy(pygame.sprite.Sprite):
                 )
                 self.facing_direction = self.facing_direction.normalize()
 
-                t = utility.normalize(score, 0, self.max_score)
-                rotate_amount = utility.lerp(self.max_inaccuracy_angle,
-                                             self.min_innacuracy_angle, t)
-                negatizer = random.choice([-1, 1])
-                self.facing_direction.rotate_ip(rotate_amount * negatizer)
+                if score != self._aim_score:
+                    t = utility.normalize(score, 0, self.max_score)
+                    self._inaccuracy_angle = utility.lerp(
+                        self.max_inaccuracy_angle,
+                        self.min_innacuracy_angle, t)
+                    self._aim_score = score
+                # one random bit picks the sign far quicker than
+                # random.choice, with the same odds
+                negatizer = _AIM_SIGNS[_getrandbits(1)]
+                self.facing_direction.rotate_ip(
+                    self._inaccuracy_angle * negatizer)
             else:
                 self.primed = False
         elif self.state == EnemyStates.BIG:
-            self.facing_direction.rotate_ip(random.randint(0, 359))
+            self.facing_direction.rotate_ip(_randrange(360))
 
         self.time_since_last_dir_change += delta_time
         if self.time_since_last_dir_change > self.next_direction_change:
@@ -388,13 +460,23 @@ class Enemy(pygame.sprite.Sprite):
         self.rect = _check_collide(self.rect.move(velocity_vector), self.area)
 
     @staticmethod
-    def spawn(min_speed, max_speed, min_angle, player_pos, min_player_distance,
-              width, height, fire_rate, shot_power, bullet_lifespan, state,
-              max_innacuracy_angle, min_innacuracy_angle,
-              max_difficulty_at_score, shot_channel, explosion_channel):
-        speed = random.randint(min_speed, max_speed)
-        direction = utility.random_angle_vector(min_angle)
-        position = utility.random_position(min_player_distance, width,
+    def spawn(config, state, player_pos):
+        """Creates an enemy at a random point on the edge of the screen.
+
+        Args:
+            config (EnemyConfig): the settings to spawn with
+            state (EnemyStates): which kind of enemy to spawn
+            player_pos (pygame.Rect): the position of the player (to
+            avoid on spawn)
+
+        Returns:
+            Enemy: the enemy that was spawned
+        """
+        width = config.width
+        height = config.height
+        speed = random.randint(config.min_speed, config.max_speed)
+        direction = utility.random_angle_vector(config.min_angle)
+        position = utility.random_position(config.min_player_distance, width,
                                            height, player_pos)
 
         switcher = random.randint(0,3)
@@ -407,20 +489,23 @@ class Enemy(pygame.sprite.Sprite):
         elif switcher == 3:
             position.y = height
 
-        return Enemy(position, direction, speed, fire_rate, shot_power,
-                     bullet_lifespan, state, max_innacuracy_angle,
-                     min_innacuracy_angle, max_difficulty_at_score,
-                     shot_channel, explosion_channel)
+        return Enemy(position, direction, speed, config.fire_rate,
+                     config.shot_power, config.bullet_lifespan, state,
+                     config.max_innacuracy_angle, config.min_innacuracy_angle,
+                     config.max_difficulty_at_score, config.shot_channel,
+                     config.explosion_channel)
 
 
 class Gun():
     def __init__(self, fire_rate, shot_power, lifespan, owner, shot_channel):
         self._fire_rate = fire_rate
         self._shot_power = shot_power
-        self._last_shot_time = 0
+        # earliest time, in ms, that the gun can fire again
+        self.next_fire_time = fire_rate
         self._bullet_lifespan = lifespan
         self.owner = owner
         self.shot_channel = shot_channel
+        self._area = pygame.display.get_surface().get_rect()
         if isinstance(self.owner, Player):
             self.shot_sound = utility.load_sound('shoot_player.wav')
         elif isinstance(self.owner, Enemy):
@@ -437,15 +522,16 @@ class Gun():
             None: not enough time has passed since the last shot
             Shot: a shot is fired
         """
-        if current_time < self._last_shot_time + self._fire_rate:
+        if current_time < self.next_fire_time:
             return None
-        self._last_shot_time = current_time
+        self.next_fire_time = current_time + self._fire_rate
         spawn_point = (self.owner.rect.center
                        + (self.owner.facing_direction
                           * (self.owner.rect.height / 2)))
         self.shot_channel.play(self.shot_sound)
         return Shot(self.owner.facing_direction, spawn_point,
-                    self._shot_power, self._bullet_lifespan, self.owner)
+                    self._shot_power, self._bullet_lifespan, self.owner,
+                    self._area)
 
 
 class Shot(pygame.sprite.Sprite):
@@ -454,7 +540,8 @@ class Shot(pygame.sprite.Sprite):
     Subclass of pygame.sprite.Sprite.
     """
 
-    def __init__(self, direction, initial_position, power, lifespan, owner):
+    def __init__(self, direction, initial_position, power, lifespan, owner,
+                 area):
         """Constructs a Shot object.
 
         Args:
@@ -464,32 +551,34 @@ class Shot(pygame.sprite.Sprite):
             starts
             power (int): the speed of the shot
             lifespan (float): how long in seconds the shot will last
+            owner (Player, Enemy): who fired the shot
+            area (pygame.Rect): the screen area the shot wraps around
         """
         super().__init__()
         folder = os.path.join('data', 'sprites', 'shot')
         self.image = utility.load_image('shot.png', folder, -1)
+        # bounding circle for collisions; it encloses the whole image
+        # at any rotation
+        self.radius = math.hypot(*self.image.get_size()) / 2
         self.rect = self.image.get_rect(
             center=pygame.math.Vector2(initial_position)
         )
         self._direction = direction
         self._rotate_image()
-        self.mask = pygame.mask.from_surface(self.image)
-        self._area = pygame.display.get_surface().get_rect()
+        self.mask = from_surface(self.image)
+        self._area = area
         self.velocity = power * self._direction
-        self._lifetime = 0.0
-        self._lifespan = lifespan
+        self.lifespan = lifespan
         self.owner = owner
 
-    def update(self, delta_time, *args, **kwargs):
-        """Called every frame to move the shot
+    def update(self, frame, *args, **kwargs):
+        """Called every frame to move the shot. Expiry is handled by
+        the ShotGroup the shot belongs to.
 
         Args:
-            delta_time (float): time since the last frame
+            frame (utility.FrameContext): this frame's values
         """
-        self._lifetime += delta_time
-        if self._lifetime >= self._lifespan:
-            self.kill()
-        change_position = self.velocity * delta_time
+        change_position = self.velocity * frame.delta_time
         self.rect = _check_collide(self.rect.move(change_position.x,
                                                   change_position.y),
                                    self._area)
@@ -499,49 +588,265 @@ class Shot(pygame.sprite.Sprite):
         """
         rotation = -math.degrees(math.atan2(self._direction.y,
                                             self._direction.x))
-        self.image = pygame.transform.rotate(self.image, rotation)
+        self.image = rotate(self.image, rotation)
         self.rect = self.image.get_rect(center=self.rect.center)
 
 
+class CachedGroup(pygame.sprite.RenderUpdates):
+    """A RenderUpdates group that keeps the list sprites() returns until
+    a sprite is added or removed, rather than copying it on every call.
+    Iterating a group, updating it and colliding with it all go through
+    sprites(), and most frames nothing joins or leaves.
+
+    The list is shared, so read it but don't change it.
+    """
+
+    def __init__(self, *sprites):
+        self._sprite_list = None  # rebuilt on the next call after a change
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._sprite_list = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._sprite_list = None
+
+    def sprites(self):
+        sprite_list = self._sprite_list
+        if sprite_list is None:
+            sprite_list = self._sprite_list = list(self.spritedict)
+        return sprite_list
+
+
+class ShotGroup(CachedGroup):
+    """A RenderUpdates group that kills its shots once their lifespan
+    has run out.
+
+    Every shot in a group shares the same lifespan, so expiry times
+    are queued in the order the shots are added and only the head of
+    the queue needs checking each frame.
+    """
+
+    def __init__(self, *sprites):
+        self._expiry_queue = collections.deque()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._expiry_queue.append(
+            (pygame.time.get_ticks() + sprite.lifespan * 1000, sprite))
+
+    def empty(self):
+        super().empty()
+        # nothing's left to expire
+        self._expiry_queue.clear()
+
+    def update(self, *args, **kwargs):
+        current_time = pygame.time.get_ticks()
+        expiry_queue = self._expiry_queue
+        while expiry_queue and expiry_queue[0][0] <= current_time:
+            expiry_queue.popleft()[1].kill()
+        super().update(*args, **kwargs)
+
+
+class SpatialGroup(CachedGroup):
+    """A RenderUpdates group that keeps a utility.SpatialHash of its
+    sprites up to date as they're added, removed and moved, rather than
+    having it rebuilt for every collision check.
+    """
+
+    def __init__(self, cell_size, *sprites):
+        """Constructs a SpatialGroup.
+
+        Args:
+            cell_size (int): cell size for the group's spatial hash
+        """
+        self.spatial_hash = utility.SpatialHash(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.spatial_hash.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.spatial_hash.remove(sprite)
+
+    def update(self, *args, **kwargs):
+        """Updates the sprites and then moves each one in the hash."""
+        super().update(*args, **kwargs)
+        move = self.spatial_hash.move
+        for sprite in self.sprites():
+            move(sprite)
+
+
+class DrawGroup(CachedGroup):
+    """Clears and draws the sprites of several groups in a single pass.
+
+    The sprites still belong to their own groups for the game logic and
+    have to be added here as well to be drawn. update() is passed on to
+    those groups, so anything they do on update still happens.
+    """
+
+    def __init__(self, *groups):
+        """Constructs a DrawGroup.
+
+        Args:
+            groups (pygame.sprite.Group): the groups to update, in order
+        """
+        super().__init__()
+        self._update_groups = groups
+
+    def update(self, *args, **kwargs):
+        for group in self._update_groups:
+            group.update(*args, **kwargs)
+
+    def draw(self, surface, bgsurf=None, special_flags=0):
+        """Draws every sprite with one blits() call.
+
+        The list of sprites is only rebuilt when membership changes.
+        Images and rects are still read every frame, as the sprites
+        move and rotate.
+
+        Args:
+            surface (pygame.Surface): the surface to draw on
+
+        Returns:
+            list: the rects of the screen that changed
+        """
+        sprites = self.sprites()
+        spritedict = self.spritedict
+        dirty = self.lostsprites
+        self.lostsprites = []
+        new_rects = surface.blits(
+            [(sprite.image, sprite.rect) for sprite in sprites])
+        for sprite, new_rect in zip(sprites, new_rects):
+            old_rect = spritedict[sprite]
+            if not old_rect:
+                dirty.append(new_rect)
+            elif new_rect.colliderect(old_rect):
+                dirty.append(new_rect.union(old_rect))
+            else:
+                dirty.append(new_rect)
+                dirty.append(old_rect)
+            spritedict[sprite] = new_rect
+        return dirty
+
+    def draw_full(self, surface):
+        """Draws every sprite with one blits() call, for when the whole
+        screen is about to be flipped and no dirty rects are needed.
+
+        The drawn rects are still recorded, so a later clear() or
+        draw() erases the right areas.
+
+        Args:
+            surface (pygame.Surface): the surface to draw on
+        """
+        sprites = self.sprites()
+        self.spritedict.update(zip(
+            sprites,
+            surface.blits([(sprite.image, sprite.rect)
+                           for sprite in sprites])))
+        # the background was redrawn under any removed sprites
+        self.lostsprites = []
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AsteroidConfig:
+    """Fixed settings for spawning asteroids, built once per game."""
+    min_speed: int
+    max_speed: int
+    min_angle: float
+    min_player_distance: int
+    width: int
+    height: int
+    explosion_channel: pygame.mixer.Channel
+
+
 class Asteroid(pygame.sprite.Sprite):
     """Class to represent an Asteroid.
 
     Subclass of pygame.sprite.Sprite.
     """
 
+    # (image, bounding radius) by (state, image number), loaded the
+    # first time each is needed and shared by every Asteroid after that
+    _image_cache = {}
+    _explosion_sound = None
+    # asteroids turn in steps of this many degrees, so each turned
+    # image and its mask can be made once and shared; both are cached
+    # by (state, image number, step) as they're first needed
+    ROTATION_STEP = 5
+    _ROTATION_STEPS = 360 // ROTATION_STEP
+    _rotation_cache = {}
+    _mask_cache = {}
+
     def __init__(self, velocity, direction, image_number,
                  spin_amount, pos=None, explosion_channel=None,
                  state=3):
         super().__init__()
         self.state = state
-        folder = os.path.join('data', 'sprites', 'asteroid')
         self.image_number = image_number
-        self.image = utility.load_image(
-            f'asteroid-{self.state}-{self.image_number}.png',
-            folder, -1
-        )
+        # bounding circle for collisions; it encloses everything drawn
+        # at any rotation
+        self.image, self.radius = self._load_image(state, image_number)
         self.rect = self.image.get_rect(center=pos)
         self._original = self.image
         self._area = pygame.display.get_surface().get_rect()
-        self.mask = pygame.mask.from_surface(self.image)
+        self._rotation_step = 0
+        self._mask = None
 
         self._spin = 0
         self._spin_amount = spin_amount
 
         self.velocity = velocity
         self._direction = direction.normalize()
+        # asteroids never change course, so the velocity vector is
+        # worked out once instead of every frame
+        self._velocity_vector = self.velocity * self._direction
         self.explosion_channel = explosion_channel
-        self.explosion_sound = utility.load_sound('explosion_asteroid.wav')
-        self.explosion_sound.set_volume(0.5)
-
-    def update(self, delta_time, *args, **kwargs):
+        self.explosion_sound = self._load_explosion_sound()
+
+    @classmethod
+    def _load_image(cls, state, image_number):
+        cached = cls._image_cache.get((state, image_number))
+        if cached is None:
+            folder = os.path.join('data', 'sprites', 'asteroid')
+            image = utility.load_image(
+                f'asteroid-{state}-{image_number}.png', folder, -1)
+            cached = (image, utility.mask_radius(from_surface(image)))
+            cls._image_cache[(state, image_number)] = cached
+        return cached
+
+    @classmethod
+    def _load_rotation(cls, state, image_number, rotation_step):
+        key = (state, image_number, rotation_step)
+        image = cls._rotation_cache.get(key)
+        if image is None:
+            image = rotate(cls._load_image(state, image_number)[0],
+                           rotation_step * cls.ROTATION_STEP)
+            cls._rotation_cache[key] = image
+        return image
+
+    @classmethod
+    def _load_explosion_sound(cls):
+        if cls._explosion_sound is None:
+            cls._explosion_sound = utility.load_sound(
+                'explosion_asteroid.wav')
+            cls._explosion_sound.set_volume(0.5)
+        return cls._explosion_sound
+
+    def update(self, frame, *args, **kwargs):
         """Called every frame to move the asteroid.
 
         Args:
-            delta_time (float): time since the last frame
+            frame (utility.FrameContext): this frame's values
         """
-        velocity_vector = self.velocity * self._direction * delta_time
-        self.rect = _check_collide(self.rect.move(velocity_vector), self._area)
+        delta_time = frame.delta_time
+        self.rect = _check_collide(
+            self.rect.move(self._velocity_vector * delta_time), self._area)
         self._rotate_image(delta_time)
 
     def _rotate_image(self, delta_time):
@@ -553,11 +858,33 @@ class Asteroid(pygame.sprite.Sprite):
         self._spin += self._spin_amount * delta_time
         if self._spin >= 360 or self._spin <= -360:
             self._spin = 0
-            self.image = self._original
+        rotation_step = (round(self._spin / self.ROTATION_STEP)
+                         % self._ROTATION_STEPS)
+        # the image only changes once the spin reaches the next step
+        if rotation_step == self._rotation_step:
+            return
+        self._rotation_step = rotation_step
+        if rotation_step:
+            self.image = self._load_rotation(self.state, self.image_number,
+                                             rotation_step)
         else:
-            self.image = pygame.transform.rotate(self._original, self._spin)
+            self.image = self._original
         self.rect = self.image.get_rect(center=self.rect.center)
-        self.mask = pygame.mask.from_surface(self.image)
+        self._mask = None
+
+    @property
+    def mask(self):
+        """The asteroid's collision mask, looked up the first time it's
+        needed after the image turns; most frames nothing gets close
+        enough to most asteroids to look at it.
+        """
+        if self._mask is None:
+            key = (self.state, self.image_number, self._rotation_step)
+            mask = self._mask_cache.get(key)
+            if mask is None:
+                mask = self._mask_cache[key] = from_surface(self.image)
+            self._mask = mask
+        return self._mask
 
     def hit(self, velocity_scale, number_to_spawn):
         """Returns new asteroids if required.
@@ -621,7 +948,7 @@ class Asteroid(pygame.sprite.Sprite):
                 new_list.extend([new_asteroid_1, new_asteroid_2])
 
             if not even:
-                if len(new_list) > 0:
+                if new_list:
                     old_image_number = new_list[-1].image_number
                     image_number = old_image_number
                     while image_number == old_image_number:
@@ -643,43 +970,36 @@ class Asteroid(pygame.sprite.Sprite):
             return
 
     @staticmethod
-    def spawn(number_of_asteroids, min_speed, max_speed, min_angle,
-              player_rect, min_player_distance, width, height,
-              explosion_channel):
+    def spawn(number_of_asteroids, config, player_rect):
         """Randomly generates new asteroids.
 
         Args:
             number_of_asteroids (int): how many asteroids to spawn
-            min_speed (int): minimum speed for an asteroid
-            max_speed (int): maximum speed for an asteroid
-            min_angle (float): minimum magnitude for x and y on a unit
-            circle to determine the angle of the asteroid's velocity
-            player_pos (pygame.Rect): the position of the player (to
+            config (AsteroidConfig): the settings to spawn with
+            player_rect (pygame.Rect): the position of the player (to
             avoid on spawn)
-            min_player_distance (int): minimum distance from the
-            player's position
-            width (int): width of the screen
-            height (int): height of the screen
 
         Returns:
             list[Asteroid]: the asteroids that were spawned
         """
+        positions = utility.random_positions(number_of_asteroids,
+                                             config.min_player_distance,
+                                             config.width, config.height,
+                                             player_rect)
         asteroid_list = []
-        while number_of_asteroids > 0:
-            speed = random.randint(min_speed, max_speed)
-            direction = utility.random_angle_vector(min_angle)
-            image_number = random.randint(0, 2)
-            position = utility.random_position(min_player_distance, width,
-                                               height, player_rect)
+        randint = random.randint
+        for position in positions:
+            speed = randint(config.min_speed, config.max_speed)
+            direction = utility.random_angle_vector(config.min_angle)
+            image_number = randint(0, 2)
 
             spin_amount = 0
             while math.fabs(spin_amount) < 100:
-                spin_amount = random.randint(-200, 200)
+                spin_amount = randint(-200, 200)
 
             asteroid_list.append(Asteroid(speed, direction, image_number,
                                           spin_amount, position,
-                                          explosion_channel))
-            number_of_asteroids -= 1
+                                          config.explosion_channel))
 
         return asteroid_list
 
@@ -691,14 +1011,18 @@ class Particles(pygame.sprite.Sprite):
 
 # on screen text
 class Title():
-    def __init__(self, text, font_file, size, font_color, pos):
-        self.font = pygame.font.Font(font_file, size)
+    def __init__(self, text, font, font_color, pos):
+        self.font = font
         self.font_color = font_color
         self.pos = pos
+        self.text_string = None
         self.update_text(text)
 
     def update_text(self, new_text):
-        self.text = self.font.render(new_text, True, self.font_color)
+        if new_text == self.text_string:
+            return
+        self.text_string = new_text
+        self.text = utility.render_text(self.font, new_text, self.font_color)
         self.text_rect = self.text.get_rect()
         self.text_rect.center = self.pos
         self.height = self.text_rect.height
@@ -720,19 +1044,18 @@ class Scoreboard():
     score and remaining lives.
     """
 
-    def __init__(self, font_file, size, font_color,
+    def __init__(self, font, font_color,
                  bg_color, pos, level, score, lives):
         """Constructs a Scoreboard object.
 
         Args:
-            font_file (str): path to .ttf font file
-            size (int): font size
+            font (pygame.font.Font): font to render the scoreboard with
             font_color (tuple): font colour
             pos (tuple): top left point of scoreboard
             level (int): starting level
             score (int): starting score
         """
-        self._font = pygame.font.Font(font_file, size)
+        self._font = font
         self._font_color = font_color
         self._bg_color = bg_color
         self._current_font_color = self._font_color
@@ -747,20 +1070,23 @@ class Scoreboard():
         else:
             self.show()
 
-        self.level_text = self._font.render(f'Level {self.level}',
-                                            True, self._current_font_color)
+        self.level_text = self._font.render(
+            f'Level {self.level}',
+            True, self._current_font_color).convert_alpha()
         self.level_text_rect = self.level_text.get_rect(topleft=self.pos)
 
-        self.score_text = self._font.render(f'Score: {str(self.score)}',
-                                            True, self._current_font_color)
+        self.score_text = self._font.render(
+            f'Score: {str(self.score)}',
+            True, self._current_font_color).convert_alpha()
         self.score_pos = (self.pos[0],
                           (self.pos[1]
                            + self.level_text_rect.height))
         self.score_text_rect = self.score_text.get_rect(
             topleft=self.score_pos
         )
-        self.lives_text = self._font.render(f'Lives: {str(self.lives)}',
-                                            True, self._current_font_color)
+        self.lives_text = self._font.render(
+            f'Lives: {str(self.lives)}',
+            True, self._current_font_color).convert_alpha()
         self.lives_pos = (self.pos[0],
                           (self.score_pos[1]
                            + self.score_text_rect.height))
@@ -776,22 +1102,25 @@ class Scoreboard():
         self._current_font_color = self._bg_color
         self._changed_state = True
 
-    def update(self, delta_time, score, level, lives, *args, **kwargs):
+    def update(self, frame, *args, **kwargs):
         """Updates level or score.
 
         Called every frame. Updates level or score if they are
         different to those stored in the scoreboard.
 
         Args:
-            level (int): the new level to be checked
-            score (int): the new score to be checked
+            frame (utility.FrameContext): holds the new level, score
+            and lives to be checked
         """
+        level = frame.level
+        score = frame.score
+        lives = frame.lives
         if level != self.level or self._changed_state:
             self.level = level
             self.level_text = self._font.render(
                 f'Level {self.level}',
                 True, self._current_font_color
-            )
+            ).convert_alpha()
             self.level_text_rect = self.level_text.get_rect(
                 topleft=self.pos
             )
@@ -801,7 +1130,7 @@ class Scoreboard():
             self.score_text = self._font.render(
                 f'Score: {str(utility.thousands(self.score))}',
                 True, self._current_font_color
-            )
+            ).convert_alpha()
             self.score_text_rect = self.score_text.get_rect(
                 topleft=self.score_pos
             )
@@ -811,7 +1140,7 @@ class Scoreboard():
             self.lives_text = self._font.render(
                 f'Lives: {str(self.lives)}', True,
                 self._current_font_color
-            )
+            ).convert_alpha()
             self.lives_text_rect = self.lives_text.get_rect(
                 topleft=self.lives_pos
             )
@@ -829,14 +1158,10 @@ class Scoreboard():
         Returns:
             list[pygame.Rect]: a list of 'dirty rects'
         """
-        rects = []
-        rects.append(screen.blit(background,
-                                 self.level_text_rect, self.level_text_rect))
-        rects.append(screen.blit(background,
-                                 self.score_text_rect, self.score_text_rect))
-        rects.append(screen.blit(background,
-                                 self.lives_text_rect, self.lives_text_rect))
-        return rects
+        return screen.blits(
+            ((background, self.level_text_rect, self.level_text_rect),
+             (background, self.score_text_rect, self.score_text_rect),
+             (background, self.lives_text_rect, self.lives_text_rect)))
 
     def draw(self, screen):
         """Called every frame. Draws the scoreboard to the screen
@@ -847,11 +1172,9 @@ class Scoreboard():
         Returns:
             list[pygame.Rect]: a list of 'dirty rects'
         """
-        rects = []
-        rects.append(screen.blit(self.level_text, self.level_text_rect))
-        rects.append(screen.blit(self.score_text, self.score_text_rect))
-        rects.append(screen.blit(self.lives_text, self.lives_text_rect))
-        return rects
+        return screen.blits(((self.level_text, self.level_text_rect),
+                             (self.score_text, self.score_text_rect),
+                             (self.lives_text, self.lives_text_rect)))
 
 
 class Highscores():
@@ -860,7 +1183,7 @@ class Highscores():
     Drawn to the screen after the game is over.
     """
 
-    def __init__(self, new_score, font_file, font_size, font_color,
+    def __init__(self, new_score, font, font_color,
                  x_pos, y_pos, padding, highlight_color):
         highscores = []
         new_highscore_position = -1
@@ -918,8 +1241,6 @@ class Highscores():
 
         highscores.sort(reverse=True)
 
-        font = pygame.font.Font(font_file, font_size)
-        font_color
         self._scores_list = []
         self.x_pos = x_pos
         self.y_pos = y_pos
@@ -930,7 +1251,8 @@ class Highscores():
             title_text = 'HIGHSCORES'
 
         new_highscore_parts = {}
-        new_highscore_text = font.render(title_text, True, font_color)
+        new_highscore_text = font.render(title_text, True,
+                                         font_color).convert_alpha()
         new_highscore_text_rect = new_highscore_text.get_rect()
         new_highscore_parts['text'] = new_highscore_text
         new_highscore_parts['text_rect'] = new_highscore_text_rect
@@ -944,10 +1266,10 @@ class Highscores():
 
             if i == new_highscore_position:
                 score_text = font.render(score_string, True, font_color,
-                                         highlight_color)
-                score_text.convert_alpha()
+                                         highlight_color).convert_alpha()
             else:
-                score_text = font.render(score_string, True, font_color)
+                score_text = font.render(score_string, True,
+                                         font_color).convert_alpha()
 
             score_text_rect = score_text.get_rect()
 
@@ -966,6 +1288,14 @@ class Highscores():
         self.height = (self._scores_list[-1]['text_rect'].bottom
                        - self._scores_list[0]['text_rect'].top)
 
+        # the scores never change once rendered, so build the blit
+        # sequences once and hand them to Surface.blits every frame
+        self._draw_sequence = tuple((score_text['text'],
+                                     score_text['text_rect'])
+                                    for score_text in self._scores_list)
+        self._clear_rects = tuple(score_text['text_rect']
+                                  for score_text in self._scores_list)
+
         with open('highscores.txt', 'w') as f:
             for i, score in enumerate(highscores):
                 f.write(f'{str(i + 1)}. {str(score)}\n')
@@ -974,19 +1304,11 @@ class Highscores():
         pass
 
     def clear(self, screen, background):
-        rects = []
-        for score_text in self._scores_list:
-            rects.append(screen.blit(background,
-                                     score_text['text_rect'],
-                                     score_text['text_rect']))
-        return rects
+        return screen.blits((background, rect, rect)
+                            for rect in self._clear_rects)
 
     def draw(self, screen):
-        rects = []
-        for score_text in self._scores_list:
-            rects.append(screen.blit(score_text['text'],
-                                     score_text['text_rect']))
-        return rects
+        return screen.blits(self._draw_sequence)
 
 
 class Buttons():
@@ -995,13 +1317,12 @@ class Buttons():
     Dynamically positions buttons based on number of labels requested.
     """
 
-    def __init__(self, font_file, size, font_color, button_color,
+    def __init__(self, font, font_color, button_color,
                  x_pos, y_pos, padding, *labels):
         """Constructs a Buttons object.
 
         Args:
-            font_file (str): path to .ttf font file
-            size (int): font size
+            font (pygame.font.Font): font to render the labels with
             font_color (tuple): font colour
             button_color (tuple): button colour
             x_pos (int): desired top left x position for the panel
@@ -1009,7 +1330,6 @@ class Buttons():
             padding (int): padding between buttons and between button
             edge and text
         """
-        font = pygame.font.Font(font_file, size)
         self.x_pos = x_pos
         self.y_pos = y_pos
         self._padding = padding
@@ -1021,7 +1341,8 @@ class Buttons():
         # render labels and get the maximum width and height.
         for i, label in enumerate(labels):
             button_parts = {}
-            button_text = font.render(label, True, font_color)
+            button_text = font.render(label, True,
+                                      font_color).convert_alpha()
             button_text_rect = button_text.get_rect()
             if button_text_rect.width > widest:
                 widest = button_text_rect.width
@@ -1049,6 +1370,19 @@ class Buttons():
         self.height = (self.buttons[-1]['button_rect'].bottom
                        - self.buttons[0]['button_rect'].top)
 
+        # reposition() moves the rects in place, so these sequences
+        # stay valid and can be passed straight to Surface.blits
+        self._draw_sequence = tuple(
+            blit for button_group in self.buttons
+            for blit in ((button_group['button'],
+                          button_group['button_rect']),
+                         (button_group['button_text'],
+                          button_group['button_text_rect'])))
+        self._clear_rects = tuple(
+            rect for button_group in self.buttons
+            for rect in (button_group['button_rect'],
+                         button_group['button_text_rect']))
+
     def reposition(self):
         for i in range(len(self.buttons)):
             button_position = (self.x_pos,
@@ -1064,15 +1398,41 @@ class Buttons():
             self.buttons[i]['button_rect'].midtop = button_position
             self.buttons[i]['button_text_rect'].midtop = text_position
 
+        # the layout only changes here, so index_at's bounds are fixed
+        # now rather than looked up on every click
+        first_rect = self.buttons[0]['button_rect']
+        self._hit_left = first_rect.left
+        self._hit_right = first_rect.right
+        self._hit_top = first_rect.top
+        self._hit_step = self._button_height + self._padding
+
+    def index_at(self, pos):
+        """Finds which button, if any, is at a point.
+
+        The buttons are all the same size and evenly stacked, so this is
+        worked out directly from the layout instead of testing each rect.
+
+        Args:
+            pos (tuple): the point to check, e.g. the mouse position
+
+        Returns:
+            int, None: index of the button (in label order) containing
+            pos, or None if pos isn't on a button
+        """
+        x, y = pos
+        if not self._hit_left <= x < self._hit_right:
+            return None
+        y_offset = y - self._hit_top
+        if y_offset < 0:
+            return None
+        index, y_within = divmod(y_offset, self._hit_step)
+        if index >= len(self.buttons) or y_within >= self._button_height:
+            return None
+        return index
+
     def clear(self, screen, background):
-        rects = []
-        for button_group in self.buttons:
-            rects.append(screen.blit(background, button_group['button_rect'],
-                                     button_group['button_rect']))
-            rects.append(screen.blit(background,
-                                     button_group['button_text_rect'],
-                                     button_group['button_text_rect']))
-        return rects
+        return screen.blits((background, rect, rect)
+                            for rect in self._clear_rects)
 
     def update(self, *args, **kwargs):
         pass
@@ -1083,13 +1443,7 @@ class Buttons():
         Args:
             screen (pygame.Surface): screen to draw buttons onto.
         """
-        rects = []
-        for button_group in self.buttons:
-            rects.append(screen.blit(button_group['button'],
-                                     button_group['button_rect']))
-            rects.append(screen.blit(button_group['button_text'],
-                                     button_group['button_text_rect']))
-        return rects
+        return screen.blits(self._draw_sequence)
 
 
 class OptionsButton(pygame.sprite.Sprite):
@@ -1152,16 +1506,11 @@ def _check_collide(newpos, area):
     Returns:
         pygame.Rect: the rect after it's been checked
     """
-    if newpos.bottom < 0:
-        newpos.top = area.height
-
-    elif newpos.top > area.height:
-        newpos.bottom = 0
-
-    elif newpos.right < 0:
-        newpos.left = area.width
-
-    elif newpos.left > area.width:
-        newpos.right = 0
+    # a rect stays put while any part of it overlaps the area (left in
+    # -width..area.width) and wraps to the far edge once it leaves; the
+    # modulo does that for both axes without branching
+    width, height = newpos.size
+    newpos.left = (newpos.left + width) % (area.width + width + 1) - width
+    newpos.top = (newpos.top + height) % (area.height + height + 1) - height
 
     return newpos
@@ -1,4 +1,6 @@
 import pygame
+from pygame import (K_ESCAPE, K_LEFT, K_LSHIFT, K_RETURN, K_RIGHT, K_SPACE,
+                    K_UP, KEYDOWN, MOUSEBUTTONDOWN, NOEVENT, QUIT)
 import sys
 import assets
 import utility
@@ -6,6 +8,28 @@ import random
 import math
 import enum
 import configparser
+import itertools
+import bisect
+
+
+# a menu with no input for this long counts as idle
+MENU_IDLE_TIME = 500  # in milliseconds
+
+
+# how long a static menu sleeps waiting for an event before it checks
+# in again; any event wakes it straight away
+MENU_WAIT_TIME = 250  # in milliseconds
+
+
+def _get_menu_events(last_event_time):
+    # a static menu that has been idle for a while has nothing to
+    # redraw, so block until there's an event instead of polling
+    if pygame.time.get_ticks() - last_event_time < MENU_IDLE_TIME:
+        return pygame.event.get()
+    event = pygame.event.wait(MENU_WAIT_TIME)
+    if event.type == NOEVENT:
+        return []
+    return [event, *pygame.event.get()]
 
 
 class GameStates(enum.Enum):
@@ -16,7 +40,38 @@ class GameStates(enum.Enum):
     END = enum.auto()
 
 
+class InputState:
+    """What a state's get_input read this frame, for its update to act
+    on. Each state keeps one and resets it every frame rather than
+    building a new dict each time.
+    """
+
+    __slots__ = ('next_state', 'save', 'change_option', 'player_thrust',
+                 'player_fire', 'player_hyperspace', 'player_turn')
+
+    def __init__(self, next_state=None):
+        self.reset(next_state)
+
+    def reset(self, next_state):
+        self.next_state = next_state
+        self.save = False
+        self.change_option = None
+        self.player_thrust = False
+        self.player_fire = False
+        self.player_hyperspace = False
+        self.player_turn = 0
+
+
 class MusicHandler():
+    # beats per second are kept scaled up by this much, so the gap
+    # between beats can be worked out in whole milliseconds
+    COUNT_SCALE = 1_000_000
+
+    __slots__ = ('low_sound', 'high_sound', 'low_channel', 'high_channel',
+                 'sounds', 'channels', 'initial_time', 'rate',
+                 'count_step', 'fastest_time', 'last_played_time',
+                 'last_played_index', 'time', 'count')
+
     def __init__(self, low_channel, high_channel, volume, initial_time, rate):
         self.low_sound = utility.load_sound('heart_low.wav')
         self.high_sound = utility.load_sound('heart_high.wav')
@@ -24,11 +79,17 @@ class MusicHandler():
         self.high_channel = high_channel
         self.low_channel.set_volume(volume)
         self.high_channel.set_volume(volume)
+        # low then high, so the next beat is always the other index
+        self.sounds = (self.low_sound, self.high_sound)
+        self.channels = (self.low_channel, self.high_channel)
         self.initial_time = initial_time
         self.rate = rate
+        # how much faster the beat gets each time it plays, worked out
+        # once rather than on every beat
+        self.count_step = rate * self.COUNT_SCALE // 1000
         self.fastest_time = self._determine_fastest_time()
         self.last_played_time = 0
-        self.last_played_sound = self.low_sound
+        self.last_played_index = 0
         self.reset()
 
     def _determine_fastest_time(self):
@@ -37,23 +98,23 @@ class MusicHandler():
         return max(first_length, second_length) + 200
 
     def _determine_sound(self):
-        if self.last_played_sound == self.low_sound:
-            return self.high_sound, self.high_channel
-        return self.low_sound, self.low_channel
+        index = 1 - self.last_played_index
+        return index, self.sounds[index], self.channels[index]
 
     def reset(self):
         self.time = self.initial_time
-        self.count = 1000 / self.time
+        self.count = 1000 * self.COUNT_SCALE // self.time
 
     def play(self, current_time):
-        if current_time < self.last_played_time + self.time:
+        if current_time - self.last_played_time < self.time:
             return
         self.last_played_time = current_time
-        next_sound, next_channel = self._determine_sound()
+        index, next_sound, next_channel = self._determine_sound()
         next_channel.play(next_sound)
-        self.last_played_sound = next_sound
-        self.time = max(self.fastest_time, 1 / (self.count / 1000))
-        self.count += self.rate / 1000
+        self.last_played_index = index
+        self.time = max(self.fastest_time,
+                        1000 * self.COUNT_SCALE // self.count)
+        self.count += self.count_step
 
 
 class StateMachine():
@@ -70,63 +131,57 @@ class StateMachine():
         self.screen = screen
         self.background = background
         self.bg_color = bg_color
+        # the background colour never changes, so fill it once here
+        # rather than every time a state is entered
+        self.background.fill(self.bg_color)
         self.clock = clock
         self.fps = fps
         self.font_color = font_color
         self.font_file = font_file
         self.button_color = button_color
         self.padding = padding
-        self.states_dict = {GameStates.INTRO: Intro(self.font_file,
-                                                    self.font_color,
-                                                    self.button_color,
-                                                    self.padding,
-                                                    self.screen,
-                                                    self.background,
-                                                    self.bg_color,
-                                                    self),
-                            GameStates.CONTROLS: Controls(self.font_file,
-                                                          self.font_color,
-                                                          self.button_color,
-                                                          self.padding,
-                                                          self.screen,
-                                                          self.background,
-                                                          self.bg_color,
-                                                          self),
-                            # GameStates.OPTIONS: Options(self.font_file,
-                            #                             self.font_color,
-                            #                             self.button_color,
-                            #                             self.padding,
-                            #                             self.screen,
-                            #                             self.background,
-                            #                             self.bg_color,
-                            #                             self),
-                            GameStates.MAIN:Main(self.font_file,
-                                                 self.font_color,
-                                                 self.button_color,
-                                                 self.padding,
-                                                 self.screen,
-                                                 self.background,
-                                                 self.bg_color,
-                                                 self, channels),
-                            GameStates.END: End(self.font_file,
-                                                self.font_color,
-                                                self.button_color,
-                                                self.padding,
-                                                self.screen,
-                                                self.background,
-                                                self.bg_color,
-                                                self)}
+        state_args = (self.font_file, self.font_color, self.button_color,
+                      self.padding, self.screen, self.background,
+                      self.bg_color, self)
+        # states are only built the first time they're entered, so
+        # quitting from the intro never loads the game's assets
+        self.state_factories = {
+            GameStates.INTRO: lambda: Intro(*state_args),
+            GameStates.CONTROLS: lambda: Controls(*state_args),
+            # GameStates.OPTIONS: lambda: Options(*state_args),
+            GameStates.MAIN: lambda: Main(*state_args, channels),
+            GameStates.END: lambda: End(*state_args)}
+        self.states_dict = {}
         self.current_state = GameStates.INTRO
+        self._allow_events(self.current_state)
+
+    def _allow_events(self, state):
+        # block everything the state doesn't handle so SDL drops it
+        # before it ever becomes a Python Event, and throw away anything
+        # left over from the previous state that it wouldn't expect
+        allowed_events = self.get_state(state).ALLOWED_EVENTS
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(allowed_events)
+        pygame.event.get(exclude=allowed_events, pump=False)
+
+    def get_state(self, state):
+        instance = self.states_dict.get(state)
+        if instance is None:
+            instance = self.states_dict[state] = self.state_factories[state]()
+        return instance
 
     def main_loop(self):
-        self.clock.tick(self.fps)
-        delta_time = self.clock.get_time() / 1000  # converted to seconds
-        input_dict = self.states_dict[self.current_state].get_input()
-        next_state = self.states_dict[self.current_state].update(
-            input_dict, delta_time)
-        self.states_dict[self.current_state].render(delta_time)
+        state = self.get_state(self.current_state)
+        # tick() already returns the frame time in milliseconds
+        frame_time = self.clock.tick(state.get_fps(self.fps))
+        delta_time = frame_time * 0.001  # converted to seconds
+        input_state = state.get_input()
+        next_state = state.update(input_state, delta_time)
+        state.render(delta_time)
 
         if next_state:
+            if next_state != self.current_state:
+                self._allow_events(next_state)
             self.current_state = next_state
             return True
         else:
@@ -140,6 +195,7 @@ class Intro():
         self.background = background
         self.seen = False
         self.state_machine = state_machine
+        self.last_event_time = 0
 
         self.BG_COLOR = bg_color
         self.FONT_FILE = font_file
@@ -151,69 +207,105 @@ class Intro():
                              # 'Options': GameStates.OPTIONS,
                              'Quit': None}
         self.BUTTON_LABELS = list(self.BUTTONS_DICT.keys())
-
-        self.title_y_pos = self.screen.get_rect().centery
+        self.input_state = InputState()
+        # each handler returns True once there's no point reading on
+        self.event_handlers = {QUIT: self._on_quit,
+                               KEYDOWN: self._on_keydown,
+                               MOUSEBUTTONDOWN: self._on_mousebuttondown}
+        self.ALLOWED_EVENTS = tuple(self.event_handlers)
+        self.title_font = utility.load_font(self.FONT_FILE, 52)
+        self.button_font = utility.load_font(self.FONT_FILE, 28)
+
+        screen_rect = self.screen.get_rect()
+        self.title_y_pos = screen_rect.centery
         self.title = assets.Title('Asteroids',
-                                  self.FONT_FILE, 52,
+                                  self.title_font,
                                   self.FONT_COLOR,
-                                  (self.screen.get_rect().centerx,
+                                  (screen_rect.centerx,
                                    self.title_y_pos))
 
-        self.buttons_panel = assets.Buttons(self.FONT_FILE, 28,
+        self.buttons_panel = assets.Buttons(self.button_font,
                                             self.FONT_COLOR,
                                             self.BUTTON_COLOR,
-                                            screen.get_rect().centerx, 0,
+                                            screen_rect.centerx, 0,
                                             self.PADDING,
                                             *self.BUTTON_LABELS)
 
-        self.buttons_y_pos = (self.screen.get_height()
+        self.buttons_y_pos = (screen_rect.height
                               - (self.PADDING * 4)
                               - self.buttons_panel.height)
 
         self.buttons_panel.y_pos = self.buttons_y_pos
         self.buttons_panel.reposition()
+        # the state each button leads to, in button order
+        self.BUTTON_TARGETS = tuple(self.BUTTONS_DICT.values())
+        # the state each hotkey leads to; None quits
+        self.KEY_TARGETS = {K_ESCAPE: None, K_RETURN: GameStates.MAIN}
         self.all_assets = [self.title, self.buttons_panel]
+        self.static_surface = None
+        self.dirty = False
 
     def _first_render(self):
-        self.background.fill(self.BG_COLOR)
-        self.screen.blit(self.background, (0, 0))
-        pygame.display.update()
+        # nothing on this screen moves, so it's drawn once and then
+        # only redrawn when the state is entered again
+        if self.static_surface is None:
+            self.static_surface = self.background.copy()
+            for asset in self.all_assets:
+                asset.draw(self.static_surface)
+        self.dirty = True
         self.seen = True
 
+    def get_fps(self, fps):
+        # get_input sleeps on the event queue once the menu is idle
+        return fps
+
+    def _on_quit(self, event, input_state):
+        input_state.next_state = None
+        return True
+
+    def _on_keydown(self, event, input_state):
+        if event.key in self.KEY_TARGETS:
+            input_state.next_state = self.KEY_TARGETS[event.key]
+            return True
+        return False
+
+    def _on_mousebuttondown(self, event, input_state):
+        index = self.buttons_panel.index_at(event.pos)
+        if index is not None:
+            input_state.next_state = self.BUTTON_TARGETS[index]
+            return True
+        return False
+
     def get_input(self):
-        input_dict = {'next_state': GameStates.INTRO}
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                input_dict['next_state'] = None
+        input_state = self.input_state
+        input_state.reset(GameStates.INTRO)
+        if self.dirty or not self.seen:
+            # the menu still has to be drawn
+            events = pygame.event.get()
+        else:
+            events = _get_menu_events(self.last_event_time)
+        if events:
+            self.last_event_time = pygame.time.get_ticks()
+        event_handlers = self.event_handlers
+        for event in events:
+            handler = event_handlers.get(event.type)
+            if handler is not None and handler(event, input_state):
                 break
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    input_dict['next_state'] = None
-                    break
-                if event.key == pygame.K_RETURN:
-                    input_dict['next_state'] = GameStates.MAIN
-                    break
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                for button in self.buttons_panel.buttons:
-                    if button['button_rect'].collidepoint(mouse_pos):
-                        next_state = self.BUTTONS_DICT[button['label']]
-                        input_dict['next_state'] = next_state
-                        break
-        return input_dict
-
-    def update(self, input_dict, *args, **kwargs):
+        return input_state
+
+    def update(self, input_state, *args, **kwargs):
         if not self.seen:
             self._first_render()
-        if input_dict['next_state']:
-            if input_dict['next_state'] != GameStates.INTRO:
+        if input_state.next_state:
+            if input_state.next_state != GameStates.INTRO:
                 self.seen = False
-        return input_dict['next_state']
+        return input_state.next_state
 
     def render(self, *args, **kwargs):
-        dirty_rects = utility.draw_all(self.all_assets, self.screen,
-                                       self.background)
-        pygame.display.update(dirty_rects)
+        if self.dirty:
+            self.screen.blit(self.static_surface, (0, 0))
+            pygame.display.flip()
+            self.dirty = False
 
 
 class Controls():
@@ -223,82 +315,121 @@ class Controls():
         self.background = background
         self.BG_COLOR = bg_color
         self.state_machine = state_machine
-
+        self.last_event_time = 0
+        self.input_state = InputState()
+        # each handler returns True once there's no point reading on
+        self.event_handlers = {QUIT: self._on_quit,
+                               KEYDOWN: self._on_keydown,
+                               MOUSEBUTTONDOWN: self._on_mousebuttondown}
+        self.ALLOWED_EVENTS = tuple(self.event_handlers)
+        self.heading_font = utility.load_font(font_file, 40)
+        self.text_font = utility.load_font(font_file, 30)
+        self.button_font = utility.load_font(font_file, 28)
+
+        screen_rect = self.screen.get_rect()
         self.heading_y_pos = 50
-        self.heading = assets.Title('Controls', font_file, 40, font_color,
-                                    (self.screen.get_rect().centerx,
+        self.heading = assets.Title('Controls', self.heading_font,
+                                    font_color,
+                                    (screen_rect.centerx,
                                      self.heading_y_pos))
 
-        expl_x_offset = int(self.screen.get_rect().centerx / 2)
-        expl_y_offset = int(self.screen.get_rect().centery / 8)
-        first_row_y = int(self.screen.get_rect().centery - expl_y_offset)
-        second_row_y = int(self.screen.get_rect().centery + expl_y_offset)
+        expl_x_offset = int(screen_rect.centerx / 2)
+        expl_y_offset = int(screen_rect.centery / 8)
+        first_row_y = int(screen_rect.centery - expl_y_offset)
+        second_row_y = int(screen_rect.centery + expl_y_offset)
         self.thrust_expl = assets.Title('Thrust: Up Arrow',
-                                        font_file, 30, font_color,
+                                        self.text_font, font_color,
                                         (expl_x_offset, first_row_y))
 
         self.turn_expl = assets.Title('Turn: L / R Arrow',
-                                      font_file, 30, font_color,
-                                      (self.screen.get_rect().centerx
+                                      self.text_font, font_color,
+                                      (screen_rect.centerx
                                        + expl_x_offset, first_row_y))
 
         self.fire_expl = assets.Title('Fire: Space',
-                                      font_file, 30, font_color,
+                                      self.text_font, font_color,
                                       (expl_x_offset, second_row_y))
 
         self.hyperspace_expl = assets.Title('Hyperspace: Left Shift',
-                                            font_file, 30, font_color,
-                                            (self.screen.get_rect().centerx
+                                            self.text_font, font_color,
+                                            (screen_rect.centerx
                                              + expl_x_offset, second_row_y))
         self.buttons_dict = {'Back': GameStates.INTRO}
         self.button_labels = list(self.buttons_dict.keys())
-        self.buttons_panel = assets.Buttons(font_file, 28, font_color,
+        self.buttons_panel = assets.Buttons(self.button_font, font_color,
                                             button_color,
-                                            self.screen.get_rect().centerx,
+                                            screen_rect.centerx,
                                             650, padding, *self.button_labels)
+        self.button_targets = tuple(self.buttons_dict.values())
 
         self.all_assets = [self.heading, self.thrust_expl, self.turn_expl,
                            self.fire_expl, self.hyperspace_expl,
                            self.buttons_panel]
+        self.static_surface = None
+        self.dirty = False
         self.seen = False
 
     def _first_render(self):
-        self.background.fill(self.BG_COLOR)
-        self.screen.blit(self.background, (0, 0))
-        pygame.display.update()
+        # nothing on this screen moves, so it's drawn once and then
+        # only redrawn when the state is entered again
+        if self.static_surface is None:
+            self.static_surface = self.background.copy()
+            for asset in self.all_assets:
+                asset.draw(self.static_surface)
+        self.dirty = True
         self.seen = True
 
+    def get_fps(self, fps):
+        # get_input sleeps on the event queue once the menu is idle
+        return fps
+
+    def _on_quit(self, event, input_state):
+        input_state.next_state = None
+        return True
+
+    def _on_keydown(self, event, input_state):
+        if event.key == K_ESCAPE:
+            input_state.next_state = GameStates.INTRO
+            return True
+        return False
+
+    def _on_mousebuttondown(self, event, input_state):
+        index = self.buttons_panel.index_at(event.pos)
+        if index is not None:
+            input_state.next_state = self.button_targets[index]
+            return True
+        return False
+
     def get_input(self):
-        input_dict = {'next_state': GameStates.CONTROLS}
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                input_dict['next_state'] = None
+        input_state = self.input_state
+        input_state.reset(GameStates.CONTROLS)
+        if self.dirty or not self.seen:
+            # the menu still has to be drawn
+            events = pygame.event.get()
+        else:
+            events = _get_menu_events(self.last_event_time)
+        if events:
+            self.last_event_time = pygame.time.get_ticks()
+        event_handlers = self.event_handlers
+        for event in events:
+            handler = event_handlers.get(event.type)
+            if handler is not None and handler(event, input_state):
                 break
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    input_dict['next_state'] = GameStates.INTRO
-                    break
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                for button in self.buttons_panel.buttons:
-                    if button['button_rect'].collidepoint(mouse_pos):
-                        input_dict['next_state'] = self.buttons_dict[button['label']]
-                        break
+        return input_state
 
-        return input_dict
-
-    def update(self, input_dict, *args, **kwargs):
+    def update(self, input_state, *args, **kwargs):
         if not self.seen:
             self._first_render()
-        if input_dict['next_state']:
-            if input_dict['next_state'] != GameStates.CONTROLS:
+        if input_state.next_state:
+            if input_state.next_state != GameStates.CONTROLS:
                 self.seen = False
-        return input_dict['next_state']
+        return input_state.next_state
 
     def render(self, *args, **kwargs):
-        dirty_rects = utility.draw_all(self.all_assets, self.screen,
-                                       self.background)
-        pygame.display.update(dirty_rects)
+        if self.dirty:
+            self.screen.blit(self.static_surface, (0, 0))
+            pygame.display.flip()
+            self.dirty = False
 
 
 class Options():
@@ -314,26 +445,37 @@ class Options():
         self.config = configparser.ConfigParser()
         self.seen = False
         self.button_speed = 100
-
-        self.heading = assets.Title('Options', self.font_file,
-                                    24, self.font_color,
-                                    (self.screen.get_rect().centerx,
+        self.input_state = InputState()
+        # each handler returns True once there's no point reading on
+        self.event_handlers = {QUIT: self._on_quit,
+                               KEYDOWN: self._on_keydown,
+                               MOUSEBUTTONDOWN: self._on_mousebuttondown}
+        self.ALLOWED_EVENTS = tuple(self.event_handlers)
+        self.heading_font = utility.load_font(self.font_file, 24)
+        self.subtitle_font = utility.load_font(self.font_file, 20)
+        self.option_font = utility.load_font(self.font_file, 16)
+        self.button_font = utility.load_font(self.font_file, 30)
+
+        screen_rect = self.screen.get_rect()
+        self.heading = assets.Title('Options', self.heading_font,
+                                    self.font_color,
+                                    (screen_rect.centerx,
                                      self.padding * 5))
-        self.column_size = self.screen.get_rect().width / 6
+        self.column_size = screen_rect.width / 6
         self.subtitle_height = 55
-        self.player_title = assets.Title('Player', self.font_file, 20,
+        self.player_title = assets.Title('Player', self.subtitle_font,
                                          self.font_color,
                                          (self.column_size,
                                           self.subtitle_height))
-        self.enemy_title = assets.Title('Enemies', self.font_file, 20,
+        self.enemy_title = assets.Title('Enemies', self.subtitle_font,
                                         self.font_color,
                                         (self.column_size * 2.25,
                                          self.subtitle_height))
-        self.asteroid_title = assets.Title('Asteroids', self.font_file, 20,
+        self.asteroid_title = assets.Title('Asteroids', self.subtitle_font,
                                            self.font_color,
                                            (self.column_size * 3.5,
                                             self.subtitle_height))
-        self.music_title = assets.Title('Music', self.font_file, 20,
+        self.music_title = assets.Title('Music', self.subtitle_font,
                                         self.font_color,
                                         (self.column_size * 4.75,
                                         self.subtitle_height))
@@ -341,18 +483,27 @@ class Options():
         self.buttons_dict = {'Save': GameStates.INTRO,
                              'Back': GameStates.INTRO}
         self.button_labels = list(self.buttons_dict.keys())
-        self.buttons_panel = assets.Buttons(self.font_file, 30,
+        self.buttons_panel = assets.Buttons(self.button_font,
                                             self.font_color,
                                             self.button_color,
                                             self.column_size * 4.75, 0,
                                             self.padding,
                                             *self.button_labels)
-        buttons_y_pos = (self.screen.get_rect().height
+        buttons_y_pos = (screen_rect.height
                          - self.buttons_panel.height
                          - self.padding)
         self.buttons_panel.y_pos = buttons_y_pos
         self.buttons_panel.reposition()
+        # the state each button leads to and whether it saves, in
+        # button order
+        self.button_targets = tuple(
+            (next_state, label == 'Save')
+            for label, next_state in self.buttons_dict.items())
         self.config_buttons = pygame.sprite.RenderUpdates()
+        # each option takes two rows: its title, then its value
+        self.option_row_height = self.padding * 5
+        self.option_y_start = self.subtitle_height + self.option_row_height
+        self.dirty = False
 
     def _first_render(self):
         self.config_buttons.empty()
@@ -362,45 +513,54 @@ class Options():
 
         self.config.read('config.ini')
 
-        self.config_titles = []
-        self.config_text_strings = []
-        for j, section in enumerate(self.config.sections()):
-            for i, option in enumerate(self.config[section]):
+        config = self.config
+        option_font = self.option_font
+        font_color = self.font_color
+        column_size = self.column_size
+        y_start = self.option_y_start
+        row_height = self.option_row_height
+        config_titles = self.config_titles = []
+        config_text_strings = self.config_text_strings = []
+        row_buttons = self.row_buttons = []
+        # (section, option, value text) for the option each arrow changes
+        button_options = self.button_options = {}
+        for j, section in enumerate(config.sections()):
+            x_pos = column_size * ((1.25 * j) + 1)
+            for i, option in enumerate(config[section]):
+                title_y_pos = y_start + row_height * 2 * i
+                text_y_pos = title_y_pos + row_height
                 title_text_string = ' '.join(option.capitalize().split('_'))
                 option_title = assets.Title(
-                    title_text_string, self.font_file, 16, self.font_color,
-                    ((self.column_size
-                      * ((1.25 * j) + 1)),
-                     (self.subtitle_height
-                      + ((self.padding * 5)
-                         + (self.padding * 5 * i) * 2))))
-
-                option_text_string = self.config[section][option]
+                    title_text_string, option_font, font_color,
+                    (x_pos, title_y_pos))
+
+                option_text_string = config[section][option]
                 option_text = assets.Title(
-                    option_text_string, self.font_file, 16, self.font_color,
-                    ((self.column_size
-                      * ((1.25 * j) + 1)),
-                     (self.subtitle_height
-                      + (((self.padding * 5) * 2)
-                        + (self.padding * 5 * i) * 2))))
+                    option_text_string, option_font, font_color,
+                    (x_pos, text_y_pos))
 
                 left_button = assets.OptionsButton(
                     'down', (option_text.text_rect.centerx - button_offset,
-                             (self.subtitle_height
-                              + (((self.padding * 5) * 2)
-                                 + (self.padding * 5 * i) * 2))),
-                    self.config, section, option)
+                             text_y_pos),
+                    config, section, option)
 
                 right_button = assets.OptionsButton(
                     'up', (option_text.text_rect.centerx + button_offset,
-                           (self.subtitle_height
-                            + (((self.padding * 5) * 2)
-                               + (self.padding * 5 * i) * 2))),
-                    self.config, section, option)
+                           text_y_pos),
+                    config, section, option)
 
-                self.config_titles.append(option_title)
-                self.config_text_strings.append(option_text)
+                config_titles.append(option_title)
+                config_text_strings.append(option_text)
+                button_options[left_button] = button_options[right_button] = (
+                    config[section], option, option_text)
                 self.config_buttons.add(left_button, right_button)
+                if i == len(row_buttons):
+                    row_buttons.append([])
+                row_buttons[i].extend((left_button, right_button))
+
+        # rows line up across the sections, so the arrows can be found
+        # by bisecting on the bottom edge of each row
+        self.row_bottoms = [row[0].rect.bottom for row in self.row_buttons]
 
         self.all_assets.extend([self.heading, self.player_title,
                                 self.enemy_title, self.asteroid_title,
@@ -409,82 +569,92 @@ class Options():
                                 *self.config_text_strings,
                                 self.config_buttons])
 
-        self.background.fill(self.bg_color)
         self.screen.blit(self.background, (0, 0))
         pygame.display.update()
+        self.dirty = True
         self.seen = True
 
-    def _update_options(self):
-        last_section_length = 0
-        for section in self.config.sections():
-            for i, option in enumerate(self.config[section]):
-                new_option_text = self.config[section][option]
-                self.config_text_strings[i + last_section_length].update_text(
-                    new_option_text)
-            last_section_length += len(self.config[section])
-
     def _change_option(self, pressed_button):
         pressed_button.update_option()
+        # only the pressed arrow's option can have changed, so refresh
+        # that one text rather than rereading every option each frame
+        section_proxy, option, option_text = (
+            self.button_options[pressed_button])
+        option_text.update_text(section_proxy[option])
+        self.dirty = True
 
     def _save_options(self):
         with open('config.ini', 'w') as configfile:
             self.config.write(configfile)
 
+    def get_fps(self, fps):
+        return fps
+
+    def _on_quit(self, event, input_state):
+        input_state.next_state = None
+        return True
+
+    def _on_keydown(self, event, input_state):
+        if event.key == K_ESCAPE:
+            input_state.next_state = GameStates.INTRO
+            return True
+        return False
+
+    def _on_mousebuttondown(self, event, input_state):
+        if event.button == 1:
+            index = self.buttons_panel.index_at(event.pos)
+            if index is not None:
+                (input_state.next_state,
+                 input_state.save) = self.button_targets[index]
+        return False
+
     def get_input(self):
-        input_dict = {'next_state': GameStates.OPTIONS,
-                      'save': False,
-                      'change_option': None}
+        input_state = self.input_state
+        input_state.reset(GameStates.OPTIONS)
 
-        mouse_pos = pygame.mouse.get_pos()
+        event_handlers = self.event_handlers
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                input_dict['next_state'] = None
+            handler = event_handlers.get(event.type)
+            if handler is not None and handler(event, input_state):
                 break
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                   input_dict['next_state'] = GameStates.INTRO
-                   break
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    for button in self.buttons_panel.buttons:
-                        if button['button_rect'].collidepoint(mouse_pos):
-                            input_dict['next_state'] = self.buttons_dict[button['label']]
-                            if button['label'] == 'Save':
-                                input_dict['save'] = True
-
-        mouse_buttons = pygame.mouse.get_pressed()
-        if mouse_buttons[0]:
-            for button in self.config_buttons:
-                if button.rect.collidepoint(mouse_pos):
-                    input_dict['change_option'] = button
-
-        return input_dict
-
-    def update(self, input_dict, delta_time, *args, **kwargs):
+
+        if pygame.mouse.get_pressed()[0]:
+            mouse_pos = pygame.mouse.get_pos()
+            # only the arrows in the row under the mouse can be hit
+            row = bisect.bisect_right(self.row_bottoms, mouse_pos[1])
+            if row < len(self.row_buttons):
+                for button in self.row_buttons[row]:
+                    if button.rect.collidepoint(mouse_pos):
+                        input_state.change_option = button
+
+        return input_state
+
+    def update(self, input_state, delta_time, *args, **kwargs):
         current_time = pygame.time.get_ticks()
         if not self.seen:
             self._first_render()
 
-        self._update_options()
-
-        if (input_dict['change_option'] is not None
+        if (input_state.change_option is not None
             and current_time - self.last_pressed >= self.button_speed):
-            self._change_option(input_dict['change_option'])
+            self._change_option(input_state.change_option)
             self.last_pressed = current_time
 
-        if input_dict['save']:
+        if input_state.save:
             self._save_options()
 
-        if input_dict['next_state']:
-            if input_dict['next_state'] != GameStates.OPTIONS:
+        if input_state.next_state:
+            if input_state.next_state != GameStates.OPTIONS:
                 self.seen = False
                 self.all_assets.clear()
-        return input_dict['next_state']
+        return input_state.next_state
 
     def render(self, *args, **kwargs):
-        self.screen.blit(self.background, (0, 0))
-        utility.draw_all(self.all_assets, self.screen, self.background)
-        pygame.display.update()
+        # the screen only changes when an option does
+        if self.dirty:
+            self.screen.blit(self.background, (0, 0))
+            utility.draw_menu(self.all_assets, self.screen, self.background)
+            pygame.display.update()
+            self.dirty = False
 
 
 class Main():
@@ -497,9 +667,15 @@ class Main():
         self.PADDING = padding
         self.BG_COLOR = bg_color
         self.LEVEL_TRANSITION_TIME = 1000
+        self.LEVEL_TRANSITION_SECONDS = self.LEVEL_TRANSITION_TIME / 1000
         self.BASE_SCORE = 150
+        # points for shooting an asteroid of each size (1 is smallest)
+        self.ASTEROID_SCORES = {state: int(self.BASE_SCORE / state)
+                                for state in (1, 2, 3)}
         self.SCOREBOARD_POS = (15, 10)
         self.SCOREBOARD_FONT_SIZE = 24
+        self.scoreboard_font = utility.load_font(self.FONT_FILE,
+                                                 self.SCOREBOARD_FONT_SIZE)
         self.STARTING_LIVES = 3
 
         self.screen = screen
@@ -508,18 +684,18 @@ class Main():
         self.seen = False
         self.state_machine = state_machine
         self.channels = channels
+        screen_rect = screen.get_rect()
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = screen_rect.size
+        self.SCREEN_CENTER = screen_rect.center
 
-        self.config = configparser.ConfigParser()
-        self.config.read('config.ini')
+        self.config = utility.load_config('config.ini')
         player_config = self.config['PLAYER']
         enemy_config = self.config['ENEMY']
         asteroid_config = self.config['ASTEROID']
         music_config = self.config['MUSIC']
 
         # player
-        self.player_remains_alive = True
-
-        self.PLAYER_POS = screen.get_rect().center
+        self.PLAYER_POS = self.SCREEN_CENTER
         self.PLAYER_DIR = (0, -1)
         self.PLAYER_FOLDER_NAME = 'player'
         self.EXTRA_LIFE_TARGET = 10000
@@ -537,6 +713,7 @@ class Main():
         self.LEVEL_TRANSITION_FLASH_SPEED = int(
             player_config['level_transition_flash_speed'])
         self.PLAYER_RESPAWN_TIME = int(player_config['respawn_time'])
+        self.PLAYER_RESPAWN_SECONDS = self.PLAYER_RESPAWN_TIME / 1000
         self.PLAYER_BULLET_LIFESPAN = float(player_config['bullet_lifespan'])
 
         # dead player
@@ -587,27 +764,55 @@ class Main():
                                           self.MUSIC_VOLUME,
                                           self.MUSIC_GAP,
                                           self.MUSIC_RATE)
+        self.ENEMY_CONFIG = assets.EnemyConfig(
+            self.ENEMY_MIN_SPEED, self.ENEMY_MAX_SPEED, self.ENEMY_MIN_ANGLE,
+            self.MIN_ENEMY_DISTANCE, self.SCREEN_WIDTH, self.SCREEN_HEIGHT,
+            1000 / self.ENEMY_FIRE_RATE, self.ENEMY_SHOT_POWER,
+            self.ENEMY_BULLET_LIFESPAN, self.ENEMY_MAX_INNACURACY_ANGLE,
+            self.ENEMY_MIN_INNACURACY_ANGLE,
+            self.ENEMY_MAX_DIFFICULTY_AT_SCORE,
+            self.channels['shoot_enemy'], self.channels['explosion_enemy'])
+        self.ASTEROID_CONFIG = assets.AsteroidConfig(
+            self.MIN_ASTEROID_SPEED, self.MAX_ASTEROID_SPEED,
+            self.MIN_ASTEROID_DIR_ANGLE, self.MIN_ASTEROID_DIST,
+            self.SCREEN_WIDTH, self.SCREEN_HEIGHT,
+            self.channels['explosion_asteroid'])
         self.enemy_attack_channel = self.channels['attack_enemy']
+
+        # collisions; cells about as big as the largest asteroid
+        self.SPATIAL_HASH_CELL_SIZE = 150
         self.enemy_attack_sound = utility.load_sound('attack_enemy.wav')
 
+        # input
+        self.ALLOWED_EVENTS = (QUIT, KEYDOWN)
+        self.input_state = InputState()
+        # the state each hotkey leads to; gameplay keys are polled
+        self.KEY_TARGETS = {K_ESCAPE: GameStates.INTRO}
+        self._space_held = False
+        self._shift_held = False
+        self.player_has_control = False  # until _first_render
+        self.frame = utility.FrameContext()
+
     def _first_render(self):
         self.score = 0
         self.extra_life_tracker = 0
         self.player_out_of_lives = False
         self.level = 1
-        self.player_alive = True
         self.asteroids_spawned = False
         self.player_hit_time = 0
         self.previous_enemy_spawn = 0
         self.enemy_spawned = False
 
         # initialise sprite groups, player and scoreboard
-        self.players = pygame.sprite.RenderUpdates()
-        self.enemies = pygame.sprite.RenderUpdates()
-        self.asteroids = pygame.sprite.RenderUpdates()
-        self.shots = pygame.sprite.RenderUpdates()
-        self.enemy_shots = pygame.sprite.RenderUpdates()
-
+        self.players = assets.CachedGroup()
+        self.enemies = assets.CachedGroup()
+        self.asteroids = assets.SpatialGroup(self.SPATIAL_HASH_CELL_SIZE)
+        self.shots = assets.ShotGroup()
+        self.enemy_shots = assets.ShotGroup()
+        # every sprite is also added here, which draws them all at once
+        self.all_sprites = assets.DrawGroup(self.players, self.enemies,
+                                            self.asteroids, self.shots,
+                                            self.enemy_shots)
 
         self.player = assets.Player(self.PLAYER_POS, self.PLAYER_DIR,
                                     self.PLAYER_THRUST, self.PLAYER_MASS,
@@ -617,19 +822,24 @@ class Main():
                                     self.PLAYER_SHOT_POWER,
                                     self.PLAYER_ANIMATION_SPEED,
                                     self.PLAYER_FOLDER_NAME,
-                                    self.player_remains_alive,
+                                    True,
                                     self.PLAYER_HYPERSPACE_LENGTH,
                                     self.BG_COLOR, self.STARTING_LIVES,
                                     self.PLAYER_RESPAWN_FLASH_SPEED,
-                                    self.PLAYER_RESPAWN_TIME / 1000,
+                                    self.PLAYER_RESPAWN_SECONDS,
                                     self.PLAYER_BULLET_LIFESPAN,
                                     self.channels['thrust_player'],
                                     self.channels['hyperspace_player'],
                                     self.channels['shoot_player'])
-        self.players.add(self.player)
+        self.player.add(self.players, self.all_sprites)
+        # swapped in for the player on each death
+        self.dead_player = assets.DeadPlayer(self.DEAD_PLAYER_FOLDER_NAME,
+                                             self.DEAD_PLAYER_ANIMATION_SPEED,
+                                             self.LEVEL_FRICTION,
+                                             self.player.mass,
+                                             self.channels['explosion_player'])
 
-        self.scoreboard = assets.Scoreboard(self.FONT_FILE,
-                                            self.SCOREBOARD_FONT_SIZE,
+        self.scoreboard = assets.Scoreboard(self.scoreboard_font,
                                             self.FONT_COLOR,
                                             self.BG_COLOR,
                                             self.SCOREBOARD_POS,
@@ -637,10 +847,8 @@ class Main():
                                             self.player.lives)
         self.scoreboard.hide()
 
-        self.all_assets.extend([self.players, self.enemies, self.asteroids,
-                                self.shots, self.enemy_shots, self.scoreboard])
+        self.all_assets.extend([self.all_sprites, self.scoreboard])
 
-        self.background.fill(self.BG_COLOR)
         self.screen.blit(self.background, (0, 0))
         pygame.display.update()
         self.level_start_time = (pygame.time.get_ticks()
@@ -648,6 +856,11 @@ class Main():
         self.previous_enemy_spawn = self.level_start_time
         self._level_started = False
         self.player_has_control = True
+        # Main is kept between games, so a key still down from the menu
+        # or the last game mustn't count as a new press
+        keys = pygame.key.get_pressed()
+        self._space_held = keys[K_SPACE]
+        self._shift_held = keys[K_LSHIFT]
         self.player_is_vulnerable = True
         self.seen = True
 
@@ -658,82 +871,89 @@ class Main():
                 channel[1].stop()
         self.all_assets.clear()
 
-    def _handle_input(self, input_dict, player_has_control, current_time):
+    def _handle_input(self, input_state, player_has_control, current_time):
         if player_has_control:
-            if input_dict['player_engine_on']:
-                self.player.engine_on()
-            if input_dict['player_engine_off']:
-                self.player.engine_off()
-            if input_dict['player_turn'] is not None:
-                self.player.turn(input_dict['player_turn'])
-            if input_dict['player_hyperspace']:
-                self.player.hyperspace(len(self.asteroids))
-            if input_dict['player_fire']:
-                shot = self.player.gun.fire(current_time)
+            player = self.player
+            # the engine latches, so only tell the player when the
+            # thrust key has changed state
+            if input_state.player_thrust != player.thrusting:
+                if input_state.player_thrust:
+                    player.engine_on()
+                else:
+                    player.engine_off()
+            if input_state.player_turn:
+                player.turn(input_state.player_turn)
+            if input_state.player_hyperspace:
+                player.hyperspace(len(self.asteroids))
+            if input_state.player_fire:
+                shot = player.gun.fire(current_time)
                 if shot is not None:
-                    self.shots.add(shot)
+                    shot.add(self.shots, self.all_sprites)
 
     def _check_player_collisions(self):
-        colliding_asteroids = pygame.sprite.groupcollide(
-            self.players, self.asteroids, False, False,
-            pygame.sprite.collide_mask)
+        # run in order on purpose: each check is a few candidates at
+        # most and stops at the first hit, which a thread pool's
+        # hand-off alone would cost more than, and a hit shot is killed
+        player = self.player
+        collided = utility.collide_circle_mask
 
-        colliding_enemy_shots = pygame.sprite.groupcollide(
-            self.players, self.enemy_shots, False, True,
-            pygame.sprite.collide_mask)
+        if utility.spatial_spritecollideany(player, self.asteroids, collided):
+            return True
 
-        colliding_spaceships = pygame.sprite.groupcollide(
-            self.players, self.enemies, False, False,
-            pygame.sprite.collide_mask)
+        # no enemy has spawned for most of a level
+        if self.enemy_shots:
+            enemy_shot = utility.spatial_spritecollideany(
+                player, self.enemy_shots, collided)
+            if enemy_shot:
+                enemy_shot.kill()
+                return True
 
-        return {**colliding_asteroids,
-                **colliding_enemy_shots,
-                **colliding_spaceships}
+        return bool(self.enemies
+                    and utility.spatial_spritecollideany(player, self.enemies,
+                                                         collided))
 
     def _kill_player(self, current_time):
-        self.dead_player = assets.DeadPlayer(self.DEAD_PLAYER_FOLDER_NAME,
-                                             self.DEAD_PLAYER_ANIMATION_SPEED,
-                                             self.player.rect.center,
-                                             self.player.facing_direction,
-                                             self.player.velocity,
-                                             self.player.velocity_direction,
-                                             self.LEVEL_FRICTION,
-                                             self.player.mass,
-                                             self.channels['explosion_player'])
-        self.players.remove(self.player)
+        self.dead_player.reset(self.player.rect.center,
+                               self.player.facing_direction,
+                               self.player.velocity,
+                               self.player.velocity_direction)
+        self.player.remove(self.players, self.all_sprites)
         self.player.lives -= 1
         self.player.alive = False
         self.player.engine_off()
         self.player_hit_time = current_time
-        self.players.add(self.dead_player)
+        self.dead_player.add(self.players, self.all_sprites)
         if self.player.lives < 1:
             return True
         else:
             return False
 
     def _respawn_player(self):
-        self.players.remove(self.dead_player)
-        self.player.respawn(self.PLAYER_RESPAWN_TIME / 1000,
+        self.dead_player.remove(self.players, self.all_sprites)
+        self.player.respawn(self.PLAYER_RESPAWN_SECONDS,
                             self.PLAYER_RESPAWN_FLASH_SPEED,
-                            self.screen.get_rect().center)
-        self.players.add(self.player)
+                            self.SCREEN_CENTER)
+        self.player.add(self.players, self.all_sprites)
 
     def _shoot_enemies(self, current_time):
-        enemies_shot_by_player = pygame.sprite.groupcollide(
+        enemies_shot_by_player = utility.spatial_groupcollide(
             self.enemies, self.shots, True, True,
-            pygame.sprite.collide_mask)
+            utility.collide_circle_mask)
 
-        for enemy, shot_list in enemies_shot_by_player.items():
-            score_gain = int(self.BASE_SCORE * enemy.state.value)
-            self.score += score_gain
-            self.extra_life_tracker += score_gain
-            enemy.explosion_channel.play(enemy.explosion_sound)
-            enemy.kill()
-            self.enemy_spawned = False
-            self.previous_enemy_spawn = current_time - self.ENEMY_OVERLAP_OFFSET
+        if not enemies_shot_by_player:
+            return
 
-        if not self.enemy_spawned:
-            self.enemy_attack_channel.stop()
+        # spatial_groupcollide has already killed the enemies
+        score_gain = 0
+        for enemy in enemies_shot_by_player:
+            score_gain += int(self.BASE_SCORE * enemy.state.value)
+            enemy.explosion_channel.play(enemy.explosion_sound)
+        self.score += score_gain
+        self.extra_life_tracker += score_gain
+        self._add_extra_life()
+        self.enemy_spawned = False
+        self.previous_enemy_spawn = current_time - self.ENEMY_OVERLAP_OFFSET
+        self.enemy_attack_channel.stop()
 
     def _spawn_enemy(self, current_time):
         new_enemy_state_gen = random.random()
@@ -743,62 +963,81 @@ class Main():
         else:
             new_enemy_state = assets.EnemyStates.BIG
 
-        self.enemies.add(assets.Enemy.spawn(
-            self.ENEMY_MIN_SPEED, self.ENEMY_MAX_SPEED,
-            self.ENEMY_MIN_ANGLE, self.player.rect, self.ENEMY_SHOT_POWER,
-            self.screen.get_rect().width, self.screen.get_rect().height,
-            1000 / self.ENEMY_FIRE_RATE, self.ENEMY_SHOT_POWER,
-            self.ENEMY_BULLET_LIFESPAN, new_enemy_state,
-            self.ENEMY_MAX_INNACURACY_ANGLE,
-            self.ENEMY_MIN_INNACURACY_ANGLE,
-            self.ENEMY_MAX_DIFFICULTY_AT_SCORE,
-            self.channels['shoot_enemy'],
-            self.channels['explosion_enemy']))
+        enemy = assets.Enemy.spawn(self.ENEMY_CONFIG, new_enemy_state,
+                                   self.player.rect)
+        enemy.add(self.enemies, self.all_sprites)
         self.previous_enemy_spawn = current_time
         self.enemy_spawned = True
 
     def _check_asteroid_collisions(self):
-        asteroids_shot_by_player = pygame.sprite.groupcollide(
-            self.asteroids, self.shots, True, True,
-            pygame.sprite.collide_mask)
-
-        asteroids_shot_by_enemies = pygame.sprite.groupcollide(
-            self.asteroids, self.enemy_shots, True, True,
-            pygame.sprite.collide_mask)
-
-        shot_asteroids = {**asteroids_shot_by_player,
-                          **asteroids_shot_by_enemies}
-
-        for asteroid, shot_list in shot_asteroids.items():
-            for shot in shot_list:
-                if isinstance(shot.owner, assets.Player):
-                    score_gain = int(self.BASE_SCORE / asteroid.state)
-                    self.score += score_gain
-                    self.extra_life_tracker += score_gain
+        # between levels there's nothing to hit, and often nothing in
+        # flight to hit it with
+        if not self.asteroids or not (self.shots or self.enemy_shots):
+            return
+
+        # look each shot up in the asteroids' spatial hash; a shot is
+        # spent on the first asteroid it hits, and the asteroids are
+        # only killed once all the shots have been checked. All that's
+        # kept per asteroid is whether the player was one who hit it
+        shot_asteroids = {}
+        query = self.asteroids.spatial_hash.query
+        collide = utility.collide_circle_mask
+        for shot in itertools.chain(self.shots.sprites(),
+                                    self.enemy_shots.sprites()):
+            for asteroid in query(shot.rect):
+                if collide(asteroid, shot):
+                    shot.kill()
+                    shot_asteroids[asteroid] = (
+                        shot_asteroids.get(asteroid, False)
+                        or isinstance(shot.owner, assets.Player))
                     break
 
-            number_to_spawn = random.randint(self.MIN_BROKEN_ASTEROIDS,
-                                             self.MAX_BROKEN_ASTEROIDS)
+        if not shot_asteroids:
+            return
+
+        # the stock config breaks every asteroid into the same number
+        # of pieces, in which case there's nothing to roll for
+        min_broken = self.MIN_BROKEN_ASTEROIDS
+        max_broken = self.MAX_BROKEN_ASTEROIDS
+        fixed_broken = min_broken == max_broken
+
+        for asteroid, hit_by_player in shot_asteroids.items():
+            asteroid.kill()
+            if hit_by_player:
+                score_gain = self.ASTEROID_SCORES[asteroid.state]
+                self.score += score_gain
+                self.extra_life_tracker += score_gain
+
+            if fixed_broken:
+                number_to_spawn = min_broken
+            else:
+                number_to_spawn = random.randint(min_broken, max_broken)
             new_asteroids = asteroid.hit(
                 self.NEW_ASTEROID_VELOCITY_SCALE, number_to_spawn)
             if new_asteroids is not None:
                 self.asteroids.add(new_asteroids)
+                self.all_sprites.add(new_asteroids)
+
+        self._add_extra_life()
 
     def _add_extra_life(self):
+        # called whenever the score goes up, rather than every frame
         if self.extra_life_tracker >= self.EXTRA_LIFE_TARGET:
             self.player.lives += 1
             self.extra_life_tracker = self.extra_life_tracker % self.EXTRA_LIFE_TARGET
 
     def _start_level_transition(self, current_time):
         self.level += 1
-        self.shots.clear(self.screen, self.background)
+        # the player's shots are only in these two groups; the whole
+        # screen is redrawn every frame, so nothing needs clearing
+        self.all_sprites.remove(self.shots)
         self.shots.empty()
         self.level_start_time = (current_time
                                  + self.LEVEL_TRANSITION_TIME)
         self.previous_enemy_spawn = self.level_start_time
-        self.player.respawn(self.LEVEL_TRANSITION_TIME / 1000,
+        self.player.respawn(self.LEVEL_TRANSITION_SECONDS,
                             self.LEVEL_TRANSITION_FLASH_SPEED,
-                            self.screen.get_rect().center,
+                            self.SCREEN_CENTER,
                             reset=False)
         self.asteroids_spawned = False
         self._level_started = False
@@ -809,90 +1048,91 @@ class Main():
         asteroid_number = min(
             self.MAX_NEW_ASTEROIDS, self.level + self.LEVEL_ASTEROIDS_OFFSET)
         ast_list = assets.Asteroid.spawn(asteroid_number,
-                                         self.MIN_ASTEROID_SPEED,
-                                         self.MAX_ASTEROID_SPEED,
-                                         self.MIN_ASTEROID_DIR_ANGLE,
-                                         self.player.rect,
-                                         self.MIN_ASTEROID_DIST,
-                                         self.screen.get_width(),
-                                         self.screen.get_height(),
-                                         self.channels['explosion_asteroid'])
+                                         self.ASTEROID_CONFIG,
+                                         self.player.rect)
         self.asteroids.add(ast_list)
+        self.all_sprites.add(ast_list)
         self.asteroids_spawned = True
         self._level_started = True
 
     def _enemy_fire(self, current_time):
-        for enemy in self.enemies.sprites():
-            if enemy.primed:
-                enemy_shot = enemy.gun.fire(current_time)
+        # only call fire() on guns that are ready; an enemy fires every
+        # few seconds, so most frames skip it. Firing doesn't change
+        # the group, so it's walked directly rather than copied
+        for enemy in self.enemies:
+            gun = enemy.gun
+            if enemy.primed and current_time >= gun.next_fire_time:
+                enemy_shot = gun.fire(current_time)
                 if enemy_shot is not None:
-                    self.enemy_shots.add(enemy_shot)
+                    enemy_shot.add(self.enemy_shots, self.all_sprites)
 
     def _check_player_control(self):
-        self.player_has_control = (self.player.alive
-                                   and not self.player.in_hyperspace)
+        player = self.player
+        self.player_has_control = player.alive and not player.in_hyperspace
 
     def _check_player_vulnerability(self):
         self._check_player_control()
         self.player_is_vulnerable = (self.player_has_control
                                      and not self.player.respawning)
 
-    def get_input(self):
-        input_dict = {'next_state': GameStates.MAIN,
-                      'player_hyperspace': False,
-                      'player_fire': False,
-                      'player_engine_on': False,
-                      'player_engine_off': False,
-                      'player_turn': None}
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                input_dict['next_state'] = None
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    input_dict['next_state'] = GameStates.INTRO
-                if event.key == pygame.K_LSHIFT:
-                    input_dict['player_hyperspace'] = True
-                if event.key == pygame.K_SPACE:
-                    input_dict['player_fire'] = True
-            elif event.type == pygame.KEYUP:
-                if event.key == pygame.K_UP:
-                    input_dict['player_engine_off'] = True
+    def get_fps(self, fps):
+        return fps
 
+    def get_input(self):
+        input_state = self.input_state
+        input_state.reset(GameStates.MAIN)
+
+        # the state machine only lets our ALLOWED_EVENTS onto the
+        # queue, so these two typed gets drain it. Most frames have no
+        # events at all; peek() pumps once and lets us skip both gets
+        if pygame.event.peek(self.ALLOWED_EVENTS):
+            if pygame.event.get(QUIT, pump=False):
+                input_state.next_state = None
+                return input_state
+            key_targets = self.KEY_TARGETS
+            for event in pygame.event.get(KEYDOWN, pump=False):
+                if event.key in key_targets:
+                    input_state.next_state = key_targets[event.key]
+                    return input_state
+
+        # gameplay keys are polled; firing and hyperspace only happen
+        # on the frame the key goes down. The held keys are tracked even
+        # without control, so a press made while the player is dead or
+        # in hyperspace doesn't go off once control comes back
         keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP]:
-            input_dict['player_engine_on'] = True
-        if keys[pygame.K_LEFT]:
-            input_dict['player_turn'] = 1
-        if keys[pygame.K_RIGHT]:
-            input_dict['player_turn'] = -1
-
-        return input_dict
-
-    def update(self, input_dict, delta_time, *args, **kwargs):
-        if not self.seen:
-            self._first_render()
-
-        current_time = pygame.time.get_ticks()
-
-        if self._level_started:
-            self.music_handler.play(current_time)
-
-        if self.enemy_spawned and not self.enemy_attack_channel.get_busy():
-            self.enemy_attack_channel.play(self.enemy_attack_sound)
-
+        space_held = keys[K_SPACE]
+        shift_held = keys[K_LSHIFT]
+        space_pressed = space_held and not self._space_held
+        shift_pressed = shift_held and not self._shift_held
+        self._space_held = space_held
+        self._shift_held = shift_held
+
+        # _handle_input ignores the keys while the player is dead or in
+        # hyperspace
+        if not self.player_has_control:
+            return input_state
+
+        input_state.player_thrust = keys[K_UP]
+        input_state.player_fire = space_pressed
+        input_state.player_hyperspace = shift_pressed
+        # 1 for left, -1 for right, 0 for neither or both
+        input_state.player_turn = keys[K_LEFT] - keys[K_RIGHT]
+
+        return input_state
+
+    def _update_player(self, input_state, current_time):
         self._check_player_control()
-        self._handle_input(input_dict, self.player_has_control, current_time)
+        self._handle_input(input_state, self.player_has_control, current_time)
 
         self._check_player_vulnerability()
         if self.player_is_vulnerable:
-            colliding_things = self._check_player_collisions()
-            if len(colliding_things) > 0 or not self.player.remains_alive:
+            if (not self.player.remains_alive
+                or self._check_player_collisions()):
                 self.player_out_of_lives = self._kill_player(current_time)
 
         if self.player_out_of_lives:
-            input_dict['next_state'] = GameStates.END
-            self.state_machine.states_dict[GameStates.END].setup(
+            input_state.next_state = GameStates.END
+            self.state_machine.get_state(GameStates.END).setup(
                 self.score, self.player.lives, self.level, self.all_assets)
 
         if (not self.player.alive
@@ -901,39 +1141,67 @@ class Main():
                  >= self.PLAYER_DEATH_TIMER)):
             self._respawn_player()
 
-        self._shoot_enemies(current_time)
+    def _resolve_collisions(self, current_time):
+        # the player's own collisions are checked in _update_player
+        if self.enemies:
+            self._shoot_enemies(current_time)
+        self._check_asteroid_collisions()
+
+    def update(self, input_state, delta_time, *args, **kwargs):
+        if not self.seen:
+            self._first_render()
+
+        current_time = pygame.time.get_ticks()
+
+        if self._level_started:
+            self.music_handler.play(current_time)
+
+        if self.enemy_spawned and not self.enemy_attack_channel.get_busy():
+            self.enemy_attack_channel.play(self.enemy_attack_sound)
+
+        self._update_player(input_state, current_time)
+        self._resolve_collisions(current_time)
 
         if (not self.enemy_spawned
             and (current_time - self.previous_enemy_spawn
                  >= self.TIME_BETWEEN_ENEMY_SPAWNS)):
             self._spawn_enemy(current_time)
 
-        self._check_asteroid_collisions()
-
-        self._add_extra_life()
-
-        if len(self.asteroids) == 0 and len(self.enemies) == 0:
+        enemies = self.enemies
+        if not self.asteroids and not enemies:
+            # the next level can't be due on the frame its wait starts
             if self.asteroids_spawned:
                 self._start_level_transition(current_time)
-            if current_time - self.level_start_time >= 0:
+            elif current_time - self.level_start_time >= 0:
                 self._start_next_level()
 
-        self._enemy_fire(current_time)
+        # checked again, as an enemy may have spawned since
+        if enemies:
+            self._enemy_fire(current_time)
 
-        if input_dict['next_state']:
-            if input_dict['next_state'] != GameStates.MAIN:
+        next_state = input_state.next_state
+        if next_state:
+            if next_state != GameStates.MAIN:
                 self._prepare_next_state()
-            return input_dict['next_state']
+            return next_state
         else:
             return None
 
     def render(self, delta_time, *args, **kwargs):
-        dirty_rects = utility.draw_all(self.all_assets, self.screen,
-                                       self.background, delta_time,
-                                       self.score, self.level,
-                                       self.player.lives,
-                                       player_rect=self.player.rect)
-        pygame.display.update(dirty_rects)
+        # _prepare_next_state has already emptied all_assets on the
+        # frame we leave, so drawing would flash up a blank screen
+        if not self.seen:
+            return
+        player = self.player
+        frame = self.frame
+        frame.delta_time = delta_time
+        frame.score = self.score
+        frame.level = self.level
+        frame.lives = player.lives
+        frame.player_rect = player.rect
+        utility.draw_game(self.all_assets, self.screen, self.background,
+                          frame)
+        pygame.display.flip()
 
 
 class End():
@@ -949,85 +1217,119 @@ class End():
                              'Main Menu': GameStates.INTRO,
                              'Quit': None}
         self.BUTTON_LABELS = list(self.BUTTONS_DICT.keys())
+        self.input_state = InputState()
+        # each handler returns True once there's no point reading on
+        self.event_handlers = {QUIT: self._on_quit,
+                               KEYDOWN: self._on_keydown,
+                               MOUSEBUTTONDOWN: self._on_mousebuttondown}
+        self.ALLOWED_EVENTS = tuple(self.event_handlers)
+        self.heading_font = utility.load_font(self.FONT_FILE, 42)
+        self.score_font = utility.load_font(self.FONT_FILE, 36)
+        self.button_font = utility.load_font(self.FONT_FILE, 28)
 
         self.screen = screen
+        self.screen_rect = screen.get_rect()
         self.background = background
         self.state_machine = state_machine
 
-    def setup(self, score, lives, level, asset_list):
+        # everything but the highscores is the same after every game,
+        # so lay it out once; the score heading is re-rendered only
+        # when the score changes
+        centerx = self.screen_rect.centerx
         self.heading_y_pos = self.TEXT_POS
-        self.score = score
-        self.lives = lives
-        self.level = level
-        self.scoreboard_dirty_rects = None
-        self.dirty_rects = []
-        self.all_assets = []
-
-        self.heading = assets.Title('Game Over', self.FONT_FILE, 42,
+        self.heading = assets.Title('Game Over', self.heading_font,
                                     self.FONT_COLOR,
-                                    (self.screen.get_rect().centerx,
+                                    (centerx,
                                      self.heading_y_pos))
 
         self.score_heading_y_pos = (self.heading_y_pos
                                     + self.heading.height
                                     + self.PADDING)
 
+        self.score = 0
         self.score_heading = assets.Title(
             ('Score: ' + str(utility.thousands(self.score))),
-            self.FONT_FILE, 36, self.FONT_COLOR,
-            (self.screen.get_rect().centerx,
+            self.score_font, self.FONT_COLOR,
+            (centerx,
              self.score_heading_y_pos))
 
         self.highscores_y_pos = (self.score_heading_y_pos
                                  + self.score_heading.height
                                  + self.PADDING)
 
-        self.highscores = assets.Highscores(self.score, self.FONT_FILE, 36,
-                                            self.FONT_COLOR,
-                                            self.screen.get_rect().centerx,
-                                            self.highscores_y_pos,
-                                            self.PADDING, self.BUTTON_COLOR)
-
-        self.buttons_panel = assets.Buttons(self.FONT_FILE, 28,
+        self.buttons_panel = assets.Buttons(self.button_font,
                                             self.FONT_COLOR,
                                             self.BUTTON_COLOR,
-                                            self.screen.get_rect().centerx,
+                                            centerx,
                                             0, self.PADDING,
                                             *self.BUTTON_LABELS)
 
-        self.buttons_y_pos = (self.screen.get_height()
+        self.buttons_y_pos = (self.screen_rect.height
                               - (self.PADDING * 4) - self.buttons_panel.height)
 
         self.buttons_panel.y_pos = self.buttons_y_pos
         self.buttons_panel.reposition()
+        # the state each button leads to, in button order
+        self.BUTTON_TARGETS = tuple(self.BUTTONS_DICT.values())
+        # the state each hotkey leads to; None quits
+        self.KEY_TARGETS = {K_ESCAPE: None, K_RETURN: GameStates.MAIN}
 
         self.TIME_TO_START = 1000
+
+    def setup(self, score, lives, level, asset_list):
+        if score != self.score:
+            self.score_heading.update_text(
+                'Score: ' + str(utility.thousands(score)))
+        self.score = score
+        self.lives = lives
+        self.level = level
+        # the game's sprites keep updating behind the menu
+        self.frame = utility.FrameContext(0, score, level, lives)
+        self.scoreboard_dirty_rects = None
+        self.all_assets = []
+
+        self.highscores = assets.Highscores(self.score, self.score_font,
+                                            self.FONT_COLOR,
+                                            self.screen_rect.centerx,
+                                            self.highscores_y_pos,
+                                            self.PADDING, self.BUTTON_COLOR)
+
         self.all_assets.extend(asset_list)
         self.menu_showing = False
         self.start_time = pygame.time.get_ticks()
 
+    def get_fps(self, fps):
+        # the game's sprites keep moving behind the menu
+        return fps
+
+    def _on_quit(self, event, input_state):
+        input_state.next_state = None
+        return True
+
+    def _on_keydown(self, event, input_state):
+        if event.key in self.KEY_TARGETS:
+            input_state.next_state = self.KEY_TARGETS[event.key]
+            return True
+        return False
+
+    def _on_mousebuttondown(self, event, input_state):
+        index = self.buttons_panel.index_at(event.pos)
+        if index is not None:
+            input_state.next_state = self.BUTTON_TARGETS[index]
+            return True
+        return False
+
     def get_input(self):
-        input_dict = {'next_state': GameStates.END}
+        input_state = self.input_state
+        input_state.reset(GameStates.END)
+        event_handlers = self.event_handlers
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                input_dict['next_state'] = None
+            handler = event_handlers.get(event.type)
+            if handler is not None and handler(event, input_state):
                 break
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    input_dict['next_state'] = None
-                    break
-                if event.key == pygame.K_RETURN:
-                    input_dict['next_state'] = GameStates.MAIN
-                    break
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                for button in self.buttons_panel.buttons:
-                    if button['button_rect'].collidepoint(mouse_pos):
-                        input_dict['next_state'] = self.BUTTONS_DICT[button['label']]
-                        break
-        return input_dict
-
-    def update(self, input_dict, delta_time, *args, **kwargs):
+        return input_state
+
+    def update(self, input_state, delta_time, *args, **kwargs):
         current_time = pygame.time.get_ticks()
 
         if (not self.menu_showing and
@@ -1039,13 +1341,12 @@ class End():
             self.all_assets.extend([self.heading, self.score_heading,
                                     self.highscores, self.buttons_panel])
 
-        return input_dict['next_state']
+        return input_state.next_state
 
     def render(self, delta_time, *args, **kwargs):
-        dirty_rects = utility.draw_all(self.all_assets, self.screen,
-                                       self.background, delta_time,
-                                       self.score, self.level,
-                                       self.lives)
+        self.frame.delta_time = delta_time
+        dirty_rects = utility.draw_menu(self.all_assets, self.screen,
+                                        self.background, self.frame)
         if self.scoreboard_dirty_rects:
             dirty_rects.extend(self.scoreboard_dirty_rects)
             self.scoreboard_dirty_rects = None
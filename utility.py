@@ -1,6 +1,8 @@
 import os
 import math
 import random
+import functools
+import configparser
 import pygame
 
 def load_image(name, folder_name, colorkey=None):
@@ -32,6 +34,44 @@ def load_image(name, folder_name, colorkey=None):
     return image
 
 
+@functools.lru_cache(maxsize=64)
+def load_font(font_file, size):
+    # every state asks for the same few fonts; open each one once so
+    # they all share it, along with its entries in render_text's cache
+    return pygame.font.Font(font_file, size)
+
+
+_config_cache = {}
+
+
+def load_config(filename):
+    """Reads a config file, reusing the last parse until the file is
+    modified again.
+
+    Args:
+        filename (str): path of the .ini file to read
+
+    Returns:
+        configparser.ConfigParser: the parsed config; it's shared, so
+        read from it but don't change it
+    """
+    mtime = os.stat(filename).st_mtime
+    cached = _config_cache.get(filename)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    config = configparser.ConfigParser()
+    config.read(filename)
+    _config_cache[filename] = (mtime, config)
+    return config
+
+
+@functools.lru_cache(maxsize=512)
+def render_text(font, text, color):
+    # rendering text is slow and menus keep asking for the same
+    # strings; the surfaces are shared, so don't draw on them
+    return font.render(text, True, color).convert_alpha()
+
+
 def load_sound(name):
     """Utility function to load sounds
 
@@ -57,12 +97,270 @@ def load_sound(name):
     return sound
 
 
-def draw_all(sprites, screen, background, *args, **kwargs):
+# reused by draw_menu every frame; callers hand it straight to
+# pygame.display.update, so it's only valid until the next call
+_dirty_rects = []
+
+
+class FrameContext:
+    """The per-frame values every sprite's update() is given. One is
+    kept per state and updated in place each frame, so a single
+    argument is passed down instead of a bundle of args and kwargs.
+    """
+
+    __slots__ = ('delta_time', 'score', 'level', 'lives', 'player_rect')
+
+    def __init__(self, delta_time=0, score=0, level=0, lives=0,
+                 player_rect=None):
+        self.delta_time = delta_time
+        self.score = score
+        self.level = level
+        self.lives = lives
+        self.player_rect = player_rect
+
+
+def draw_menu(sprites, screen, background, frame=None):
+    # menus change little per frame, so clear and redraw only the
+    # sprites and return the dirty rects to update
+    for sprite_group in sprites:
+        sprite_group.clear(screen, background)
+        sprite_group.update(frame)
+    _dirty_rects.clear()
+    for sprite_group in sprites:
+        _dirty_rects.extend(sprite_group.draw(screen))
+    return _dirty_rects
+
+
+def draw_game(sprites, screen, background, frame):
+    # for a full-screen flip: one background blit replaces the
+    # per-sprite clears and there are no dirty rects to collect
+    screen.blit(background, (0, 0))
     for sprite_group in sprites:
-            sprite_group.clear(screen, background)
-            sprite_group.update(*args, **kwargs)
-    return [dirty_rect for sprite_group in sprites
-                       for dirty_rect in sprite_group.draw(screen)]
+        sprite_group.update(frame)
+        # groups that can skip working out dirty rects do so
+        getattr(sprite_group, 'draw_full', sprite_group.draw)(screen)
+
+
+class SpatialHash:
+    """Buckets sprites by the grid cells their rects cover, so a
+    collision check only has to look at sprites in nearby cells.
+    """
+
+    def __init__(self, cell_size):
+        """Constructs an empty SpatialHash.
+
+        Args:
+            cell_size (int): width and height of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self._sprite_cells = {}
+
+    def _cell_range(self, rect):
+        cell_size = self.cell_size
+        return (rect.left // cell_size, rect.right // cell_size,
+                rect.top // cell_size, rect.bottom // cell_size)
+
+    def _insert(self, sprite, cell_range):
+        left, right, top, bottom = cell_range
+        cells = self.cells
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cells.setdefault((cell_x, cell_y), []).append(sprite)
+
+    def _remove(self, sprite, cell_range):
+        left, right, top, bottom = cell_range
+        cells = self.cells
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = cells[(cell_x, cell_y)]
+                cell.remove(sprite)
+                if not cell:
+                    del cells[(cell_x, cell_y)]
+
+    def add(self, sprite):
+        cell_range = self._cell_range(sprite.rect)
+        self._sprite_cells[sprite] = cell_range
+        self._insert(sprite, cell_range)
+
+    def remove(self, sprite):
+        cell_range = self._sprite_cells.pop(sprite, None)
+        if cell_range is not None:
+            self._remove(sprite, cell_range)
+
+    def move(self, sprite):
+        """Rebuckets a sprite after its rect has changed. Only touches
+        the cells if the sprite has actually crossed into new ones.
+
+        Args:
+            sprite (pygame.sprite.Sprite): a sprite already in the hash
+        """
+        old_range = self._sprite_cells[sprite]
+        new_range = self._cell_range(sprite.rect)
+        if new_range == old_range:
+            return
+        self._remove(sprite, old_range)
+        self._insert(sprite, new_range)
+        self._sprite_cells[sprite] = new_range
+
+    def clear(self):
+        self.cells.clear()
+        self._sprite_cells.clear()
+
+    def query(self, rect):
+        """Finds the sprites sharing a cell with rect.
+
+        Args:
+            rect (pygame.Rect): the area to look around
+
+        Returns:
+            set[pygame.sprite.Sprite]: candidate sprites, which still
+            need a proper collision test
+        """
+        left, right, top, bottom = self._cell_range(rect)
+        get_cell = self.cells.get
+        found = set()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = get_cell((cell_x, cell_y))
+                if cell:
+                    found.update(cell)
+        return found
+
+
+# below this many sprites querying a hash costs more than it saves
+SPATIAL_HASH_MIN_SPRITES = 32
+
+
+def spatial_groupcollide(groupa, groupb, dokilla, dokillb, collided):
+    """Drop-in for pygame.sprite.groupcollide that only runs collided
+    on likely candidates for each sprite in groupa: its neighbours in
+    groupb's spatial hash if it keeps one, or else the sprites whose
+    rects overlap it, as found by a single Rect.collidelistall.
+
+    Args:
+        groupa (pygame.sprite.Group): sprites to check
+        groupb (pygame.sprite.Group): sprites to check against; if it
+        keeps its own spatial_hash up to date that is used as is
+        dokilla (bool): kill sprites in groupa that collide
+        dokillb (bool): kill sprites in groupb that collide
+        collided (callable): collision callback taking two sprites
+
+    Returns:
+        dict: each colliding sprite in groupa mapped to a list of the
+        sprites in groupb it collided with
+    """
+    spatial_hash = getattr(groupb, 'spatial_hash', None)
+    if spatial_hash is None or len(groupb) < SPATIAL_HASH_MIN_SPRITES:
+        sprites_b = groupb.sprites()
+        rects_b = [sprite_b.rect for sprite_b in sprites_b]
+
+        def candidates(rect):
+            return [sprites_b[index]
+                    for index in rect.collidelistall(rects_b)]
+    else:
+        candidates = spatial_hash.query
+
+    crashed = {}
+    for sprite_a in groupa.sprites():
+        # a sprite killed by an earlier hit is no longer alive
+        hits = [sprite_b for sprite_b in candidates(sprite_a.rect)
+                if sprite_b.alive() and collided(sprite_a, sprite_b)]
+        if hits:
+            crashed[sprite_a] = hits
+            if dokillb:
+                for sprite_b in hits:
+                    sprite_b.kill()
+            if dokilla:
+                sprite_a.kill()
+    return crashed
+
+
+def spatial_spritecollideany(sprite, group, collided):
+    """Drop-in for pygame.sprite.spritecollideany that only runs
+    collided on likely candidates: the sprites near sprite in group's
+    spatial hash if it keeps one, or else those whose rects overlap, as
+    found by a single Rect.collidelistall.
+
+    Args:
+        sprite (pygame.sprite.Sprite): sprite to check
+        group (pygame.sprite.Group): sprites to check against
+        collided (callable): collision callback taking two sprites
+
+    Returns:
+        pygame.sprite.Sprite: the first sprite in group that collides,
+        or None
+    """
+    spatial_hash = getattr(group, 'spatial_hash', None)
+    if spatial_hash is None or len(group) < SPATIAL_HASH_MIN_SPRITES:
+        # too few for the hash to pay off; let collidelistall find the
+        # overlapping rects in one C call and only test those further
+        others = group.sprites()
+        for index in sprite.rect.collidelistall(
+                [other.rect for other in others]):
+            if collided(sprite, others[index]):
+                return others[index]
+        return None
+    for other in spatial_hash.query(sprite.rect):
+        if collided(sprite, other):
+            return other
+    return None
+
+
+def collide_circle_mask(left, right):
+    """Collision callback that narrows down with the cheap tests first:
+    rects, then bounding circles, and only then the pixel-perfect
+    mask test.
+
+    Args:
+        left (pygame.sprite.Sprite): sprite with a rect, a radius
+        enclosing its image and a mask
+        right (pygame.sprite.Sprite): sprite with a rect, a radius
+        enclosing its image and a mask
+
+    Returns:
+        bool, tuple: falsy if the sprites don't collide, otherwise
+        the first point of overlap between the masks
+    """
+    left_rect = left.rect
+    right_rect = right.rect
+    if not left_rect.colliderect(right_rect):
+        return False
+    x_distance = left_rect.centerx - right_rect.centerx
+    y_distance = left_rect.centery - right_rect.centery
+    radii = left.radius + right.radius
+    if x_distance * x_distance + y_distance * y_distance > radii * radii:
+        return False
+    # what pygame.sprite.collide_mask does, minus its fallback for
+    # sprites without a mask, which every caller's sprites have
+    return left.mask.overlap(right.mask, (right_rect.x - left_rect.x,
+                                          right_rect.y - left_rect.y))
+
+
+def mask_radius(mask):
+    """Works out a bounding circle for collide_circle_mask from the set
+    pixels of a mask rather than its whole size, which for round
+    sprites rejects noticeably more pairs before the mask test.
+
+    Args:
+        mask (pygame.mask.Mask): mask of the sprite's unrotated image
+
+    Returns:
+        float: radius about the image's centre enclosing every set
+        pixel at any rotation
+    """
+    width, height = mask.get_size()
+    centre_x = width / 2
+    centre_y = height / 2
+    radius = 0
+    # the furthest pixel is always on the outline of its component
+    for component in mask.connected_components():
+        for x, y in component.outline():
+            radius = max(radius, math.hypot(x + 0.5 - centre_x,
+                                            y + 0.5 - centre_y))
+    # allow for pixel corners, rect centres rounding and rotation
+    return radius + 2
+
 
 def thousands(n):
     return "{:,}".format(n)
@@ -88,11 +386,23 @@ def random_angle(min_angle, max_angle):
     return angle
 
 def random_position(min_distance, width, height, avoid_rect):
-    distance = 0
-    while distance < min_distance:
-        position_x = random.randint(0, width)
-        position_y = random.randint(0, height)
-        x_distance = math.fabs(position_x - avoid_rect.centerx)
-        y_distance = math.fabs(position_y - avoid_rect.centery)
-        distance = math.hypot(x_distance, y_distance)
-    return pygame.math.Vector2(position_x, position_y)
+    return random_positions(1, min_distance, width, height, avoid_rect)[0]
+
+def random_positions(count, min_distance, width, height, avoid_rect):
+    # compare squared distances so each rejected sample is just a few
+    # integer operations rather than fabs/hypot calls; the setup is
+    # shared by every position in the batch
+    avoid_x, avoid_y = avoid_rect.center
+    min_distance_squared = min_distance * min_distance
+    randint = random.randint
+    Vector2 = pygame.math.Vector2
+    positions = []
+    while len(positions) < count:
+        position_x = randint(0, width)
+        position_y = randint(0, height)
+        x_distance = position_x - avoid_x
+        y_distance = position_y - avoid_y
+        if (x_distance * x_distance
+                + y_distance * y_distance) >= min_distance_squared:
+            positions.append(Vector2(position_x, position_y))
+    return positions